@@ -4,6 +4,7 @@ from sqlalchemy import pool
 from alembic import context
 from app.database import Base
 from app.config import settings
+import app.models  # noqa: F401  registers every table on Base.metadata
 import asyncio
 
 # Alembic Config object
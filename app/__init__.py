@@ -1,4 +1,15 @@
 # app/__init__.py
 
-from .main import app  
-__all__ = ["app"] 
+# The FastAPI app is loaded on first access (`from app import app`, or
+# `uvicorn app:app`), so Celery workers, the bootstrap CLI and Alembic can
+# import `app.*` modules without building the API and importing every router.
+
+
+def __getattr__(name):
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["app"]
@@ -0,0 +1,88 @@
+# app/background_tasks/alignment.py
+
+# Exact block alignment of plagiarism pairs. Kept free of app imports: the
+# alignment pool's worker processes import only this module.
+
+import time
+from difflib import SequenceMatcher
+from typing import List, Dict, Any
+
+ALIGNMENT_MAX_CHARS = 20_000  # Each side is truncated to this length
+ALIGNMENT_WINDOW = 2_000  # Source is aligned window by window so the deadline can be checked
+ALIGNMENT_TIMEOUT = 2.0  # Seconds of alignment per pair before giving up
+
+
+def align_pair(
+    a: str,
+    b: str,
+    min_length: int = 50,
+    timeout: float = ALIGNMENT_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Exact block alignment of `a` against `b` with a length cap and deadline.
+
+    `b` is analysed once; `a` is fed through in windows so that a single huge
+    pair cannot monopolise the worker. Blocks that continue across a window
+    boundary are merged back together before filtering by `min_length`.
+
+    Each window is matched against the whole of `b`, so windows may match
+    the same region of `b`; the ratio only counts characters of `b` not
+    already covered, which keeps it within `SequenceMatcher.ratio()`'s
+    meaning (and equal to it when `a` fits in a single window).
+    """
+    a, b = a[:ALIGNMENT_MAX_CHARS], b[:ALIGNMENT_MAX_CHARS]
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(b)
+    deadline = time.perf_counter() + timeout
+
+    blocks: List[List[int]] = []  # [source_start, match_start, size]
+    covered = bytearray(len(b))  # 1 for characters of `b` already matched
+    matched = 0
+    truncated = False
+    for offset in range(0, len(a), ALIGNMENT_WINDOW):
+        if time.perf_counter() > deadline:
+            truncated = True
+            break
+        matcher.set_seq1(a[offset : offset + ALIGNMENT_WINDOW])
+        for m in matcher.get_matching_blocks():
+            if not m.size:
+                continue
+            matched += m.size - covered.count(1, m.b, m.b + m.size)
+            covered[m.b : m.b + m.size] = b"\x01" * m.size
+            start = offset + m.a
+            last = blocks[-1] if blocks else None
+            if last and last[0] + last[2] == start and last[1] + last[2] == m.b:
+                last[2] += m.size
+            else:
+                blocks.append([start, m.b, m.size])
+
+    total = len(a) + len(b)
+    return {
+        "ratio": 2.0 * matched / total if total else 0.0,
+        "truncated": truncated,
+        "blocks": [
+            {
+                "source_start": start,
+                "source_end": start + size,
+                "match_start": match_start,
+                "match_end": match_start + size,
+                "content": a[start : start + size],
+            }
+            for start, match_start, size in blocks
+            if size > min_length
+        ],
+    }
+
+
+# Texts shared with alignment worker processes, set once per pool
+_worker_texts: List[str] = []
+
+
+def init_alignment_worker(texts: List[str]):
+    global _worker_texts
+    _worker_texts = texts
+
+
+def align_indices(pair: tuple[int, int]) -> Dict[str, Any]:
+    i, j = pair
+    return align_pair(_worker_texts[i], _worker_texts[j])
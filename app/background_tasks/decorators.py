@@ -1,53 +1,124 @@
 # app/background_tasks/decorators.py
 
 from app.models import BackgroundTask, BackgroundTaskType
-from app.database import AsyncSessionLocal
-from sqlalchemy import update
+from app.database import engine
+from app.config import settings
+from app.utils import record_job_duration, inspect_queries
+from sqlalchemy import insert, update
+import inspect
+import time
 import uuid
+from contextlib import nullcontext
+from datetime import datetime, timezone
 from functools import wraps
 from celery import shared_task
-from asgiref.sync import async_to_sync  
+from .runner import run_async
+from .scheduler import acquire_job_lock, release_job_lock, last_watermark
 
 
-
-async def create_task_record(task_type: BackgroundTaskType, parameters: dict = None):
-    async with AsyncSessionLocal() as db:
-        task = BackgroundTask(
-            task_type=task_type, 
-            parameters=parameters, 
-            status="pending"
+async def create_task_record(
+    task_type: BackgroundTaskType,
+    parameters: dict = None,
+    status: str = "pending",
+    name: str = None,
+) -> uuid.UUID:
+    task_id = uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(BackgroundTask).values(
+                id=task_id,
+                name=name,
+                task_type=task_type,
+                parameters=parameters,
+                status=status,
+            )
         )
-        db.add(task)
-        await db.commit()
-        await db.refresh(task)
-        return task.id
+    return task_id
+
 
 async def update_task_status(task_id: uuid.UUID, status: str, result: str = None):
-    async with AsyncSessionLocal() as db:
-        await db.execute(
+    async with engine.begin() as conn:
+        await conn.execute(
             update(BackgroundTask)
             .where(BackgroundTask.id == task_id)
             .values(status=status, result=result)
         )
-        await db.commit()
 
 
+async def run_tracked(
+    name: str,
+    task_type: BackgroundTaskType,
+    func,
+    args,
+    kwargs,
+    pass_task_id: bool,
+    pass_since: bool,
+    exclusive: bool,
+):
+    """
+    Run a job with its status bookkeeping inside a single coroutine.
+
+    The record is created directly as 'processing' and finalised once, so a
+    task costs two short statements on pooled connections of the shared engine
+    instead of four sessions and event loops.
 
-def with_task_tracking(task_type: BackgroundTaskType):
+    Exclusive jobs first take a cluster-wide lock and are skipped while another
+    run holds it. Jobs that accept `since` receive the watermark of their last
+    successful run; this run's start time is recorded as the next watermark.
+    So is a full run's (`since=None` passed explicitly); a run given an explicit
+    `since` covers only part of the history and records none.
+    """
+    job = name.rsplit(".", 1)[-1]
+    start = time.perf_counter()
+    owner = None
+    if exclusive:
+        owner = await acquire_job_lock(name)
+        if owner is None:
+            record_job_duration(job, "skipped", time.perf_counter() - start)
+            return f"Skipped: {name} is already running"
+    try:
+        parameters = dict(kwargs)
+        if pass_since and kwargs.get("since") is None:
+            parameters["watermark"] = datetime.now(timezone.utc).isoformat()
+            if "since" not in kwargs:
+                kwargs = {**kwargs, "since": await last_watermark(name)}
+        task_id = await create_task_record(task_type, parameters, status="processing", name=name)
+        try:
+            with inspect_queries(job) if settings.QUERY_INSPECTION else nullcontext():
+                if pass_task_id:
+                    result = await func(*args, **kwargs, task_id=task_id)
+                else:
+                    result = await func(*args, **kwargs)
+        except Exception as e:
+            record_job_duration(job, "failed", time.perf_counter() - start)
+            await update_task_status(task_id, "failed", str(e))
+            raise
+        record_job_duration(job, "completed", time.perf_counter() - start)
+        await update_task_status(task_id, "completed", str(result))
+        return result
+    finally:
+        if owner is not None:
+            await release_job_lock(name, owner)
+
+
+def with_task_tracking(task_type: BackgroundTaskType, exclusive: bool = False):
     def decorator(func):
+        # Only jobs that declare `task_id` / `since` receive them
+        signature = inspect.signature(func).parameters
+        pass_task_id = "task_id" in signature
+        pass_since = "since" in signature
+
         @shared_task(bind=True)
         @wraps(func)
-        def sync_wrapper(self, *args, **kwargs):  # Change to sync wrapper
-            # Wrap all async calls with async_to_sync
-            task_id = async_to_sync(create_task_record)(task_type, kwargs)
+        def sync_wrapper(self, *args, **kwargs):
             try:
-                async_to_sync(update_task_status)(task_id, "processing")
-                # Execute the original async func via async_to_sync
-                result = async_to_sync(func)(*args, **kwargs, task_id=task_id)
-                async_to_sync(update_task_status)(task_id, "completed", str(result))
-                return result
+                return run_async(
+                    run_tracked(
+                        self.name, task_type, func, args, kwargs,
+                        pass_task_id, pass_since, exclusive,
+                    )
+                )
             except Exception as e:
-                async_to_sync(update_task_status)(task_id, "failed", str(e))
                 raise self.retry(exc=e)
         return sync_wrapper
-    return decorator
\ No newline at end of file
+    return decorator
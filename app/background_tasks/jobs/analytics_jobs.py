@@ -1,27 +1,203 @@
 # app/background_tasks/jobs/analytics_jobs.py
-from app.models import Course, Analytics, Student
+from app.models import (
+    Analytics,
+    Assignment,
+    BackgroundTaskType,
+    Enrollment,
+    EnrollmentStatus,
+    Student,
+    Submission,
+)
 from app.database import AsyncSessionLocal
+from app.utils import chunked, dialect_insert
+from ..decorators import with_task_tracking
+from datetime import datetime, timezone
+from sqlalchemy import and_, distinct, func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
 
-# TODO: improve analytics model
-# TODO: make async completely
-# TODO: write helper functions
-# async def generate_course_analytics(course_id):
-#     async with AsyncSessionLocal() as db:
-#         course = db.query(Course).get(course_id)
-#         analytics = Analytics(course_id=course_id)
-
-#         # Calculate metrics
-#         analytics.enrollment_count = len(course.enrollments)
-#         analytics.average_grade = calculate_average_grade(course)
-#         analytics.completion_rate = calculate_completion_rate(course)
-
-#         db.add(analytics)
-#         db.commit()
-
-# async def update_all_student_progress():
-#     async with AsyncSessionLocal() as db:
-#         students = db.query(Student).all()
-#         for student in students:
-#             progress = calculate_progress(student)
-#             student.progress = progress
-#         db.commit()
+# Courses aggregated by one grouped query
+COURSE_CHUNK_SIZE = 20
+
+
+@with_task_tracking(BackgroundTaskType.PROGRESS_REPORT, exclusive=True)
+async def refresh_student_analytics(since: datetime = None, task_id: uuid.UUID = None):
+    """
+    Recompute per-student, per-course analytics and upsert them into Analytics
+
+    Completion rate, average grade and last activity come from grouped
+    aggregates over enrollments and submissions, one chunk of courses at a
+    time, each chunk committed on its own. With a `since` watermark only
+    courses with activity since the last successful run are visited, and
+    within them only students whose submissions or enrollments were created
+    or changed (graded, completed, ...) in that course since then; that set is
+    read once per run, through the created/updated timestamp indexes. Pass `since=None`
+    explicitly for a full rebuild, as the daily rebuild-analytics schedule
+    does for changes no timestamp records (self-reported progress).
+    """
+    async with AsyncSessionLocal() as db:
+        if since is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            changed = await changed_students_by_course(db, since)
+            course_ids = list(changed)
+        else:
+            changed = None
+            course_ids = (await db.scalars(select(distinct(Enrollment.course_id)))).all()
+
+        refreshed = 0
+        for ids in chunked(course_ids, COURSE_CHUNK_SIZE):
+            student_ids = None if changed is None else set().union(*(changed[course_id] for course_id in ids))
+            rows = await aggregate_courses(db, ids, student_ids)
+            for batch in chunked(rows):
+                await upsert_analytics(db, batch)
+            await db.commit()
+            refreshed += len(rows)
+    return {"courses": len(course_ids), "refreshed": refreshed}
+
+
+def submission_changed(submission, since: datetime):
+    """Submitted, graded or otherwise updated after `since`."""
+    # updated_at is NULL on rows that predate the column
+    return or_(submission.submitted_at > since, submission.updated_at > since)
+
+
+def enrollment_changed(enrollment, since: datetime):
+    """Enrolled, completed or otherwise updated after `since`."""
+    return or_(enrollment.enrolled_at > since, enrollment.updated_at > since)
+
+
+async def changed_students_by_course(db: AsyncSession, since: datetime) -> dict[uuid.UUID, set[uuid.UUID]]:
+    """Students whose submissions or enrollments changed after `since` (naive UTC), per course."""
+    rows = await db.execute(
+        union(
+            select(Assignment.course_id, Submission.student_id)
+            .join(Submission, Submission.assignment_id == Assignment.id)
+            .where(submission_changed(Submission, since)),
+            select(Enrollment.course_id, Enrollment.student_id).where(enrollment_changed(Enrollment, since)),
+        )
+    )
+    changed: dict[uuid.UUID, set[uuid.UUID]] = {}
+    for course_id, student_id in rows:
+        changed.setdefault(course_id, set()).add(student_id)
+    return changed
+
+
+async def aggregate_courses(
+    db: AsyncSession, course_ids: list[uuid.UUID], student_ids: set[uuid.UUID] = None
+) -> list[dict]:
+    """
+    Aggregate analytics for every enrollment in the given courses.
+
+    Args:
+        db (AsyncSession): The database session.
+        course_ids (list[uuid.UUID]): Courses to aggregate.
+        student_ids (set[uuid.UUID]): If set, only these students' enrollments.
+
+    Returns:
+        list[dict]: Analytics rows ready to upsert.
+    """
+    assignment_totals = dict(
+        (
+            await db.execute(
+                select(Assignment.course_id, func.count())
+                .where(Assignment.course_id.in_(course_ids))
+                .group_by(Assignment.course_id)
+            )
+        ).all()
+    )
+
+    stmt = (
+        select(
+            Enrollment.course_id,
+            Enrollment.student_id,
+            Enrollment.status,
+            Enrollment.enrolled_at,
+            func.count(distinct(Submission.assignment_id)).label("submitted"),
+            func.avg(Submission.grade).label("average_grade"),
+            func.max(Submission.submitted_at).label("last_submitted"),
+        )
+        .outerjoin(Assignment, Assignment.course_id == Enrollment.course_id)
+        .outerjoin(
+            Submission,
+            and_(
+                Submission.assignment_id == Assignment.id,
+                Submission.student_id == Enrollment.student_id,
+            ),
+        )
+        .where(Enrollment.course_id.in_(course_ids))
+        .group_by(
+            Enrollment.course_id,
+            Enrollment.student_id,
+            Enrollment.status,
+            Enrollment.enrolled_at,
+        )
+    )
+    if student_ids is None:
+        aggregates = (await db.execute(stmt)).all()
+    else:
+        aggregates = []
+        for batch in chunked(student_ids):
+            aggregates.extend((await db.execute(stmt.where(Enrollment.student_id.in_(batch)))).all())
+
+    # Self-reported progress, fetched separately since JSON cannot be grouped on
+    progress = {}
+    for student_ids in chunked({row.student_id for row in aggregates}):
+        progress.update(
+            (await db.execute(select(Student.id, Student.progress).where(Student.id.in_(student_ids)))).all()
+        )
+
+    return [
+        {
+            "id": uuid.uuid4(),
+            "course_id": row.course_id,
+            "student_id": row.student_id,
+            "completion_rate": completion_rate(
+                row.status,
+                row.submitted,
+                assignment_totals.get(row.course_id, 0),
+                (progress.get(row.student_id) or {}).get(str(row.course_id)),
+            ),
+            "average_grade": row.average_grade,
+            "assignments_submitted": row.submitted,
+            "last_active": max(
+                (t for t in (row.last_submitted, row.enrolled_at) if t is not None),
+                default=None,
+            ),
+        }
+        for row in aggregates
+    ]
+
+
+def completion_rate(
+    status: EnrollmentStatus, submitted: int, total: int, reported_progress=None
+) -> float:
+    """
+    Completion of a course as a fraction between 0 and 1.
+
+    Completed enrollments count as 1. Otherwise it is the share of the course's
+    assignments submitted, raised to the student's self-reported progress
+    (`Student.progress[course_id]`, a percentage) when that is higher.
+    """
+    if status == EnrollmentStatus.COMPLETED:
+        return 1.0
+    rate = submitted / total if total else 0.0
+    if isinstance(reported_progress, (int, float)):
+        rate = max(rate, min(reported_progress / 100, 1.0))
+    return round(rate, 4)
+
+
+async def upsert_analytics(db: AsyncSession, rows: list[dict]):
+    """Insert or refresh Analytics rows keyed by (course_id, student_id)."""
+    stmt = dialect_insert(db, Analytics.__table__).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["course_id", "student_id"],
+            set_={
+                "completion_rate": stmt.excluded.completion_rate,
+                "average_grade": stmt.excluded.average_grade,
+                "assignments_submitted": stmt.excluded.assignments_submitted,
+                "last_active": stmt.excluded.last_active,
+                "updated_at": func.now(),
+            },
+        )
+    )
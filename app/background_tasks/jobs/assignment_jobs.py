@@ -1,66 +1,100 @@
 # app/background_tasks/jobs/assignment_jobs.py
 from app.models import (
     Assignment,
-    Notification,
+    AssignmentStatus,
+    Course,
+    Enrollment,
     BackgroundTaskType,
     NotificationType,
     Submission,
 )
 from ..decorators import with_task_tracking
+from app.utils import chunked, enrolled_students, make_dedup_key, fan_out_notifications
 from app.database import AsyncSessionLocal
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, exists, literal, or_, update
 import uuid
 
 
-@with_task_tracking(BackgroundTaskType.ASSIGNMENT)
-async def handle_assignment_reminders(task_id: uuid.UUID = None):
+@with_task_tracking(BackgroundTaskType.ASSIGNMENT, exclusive=True)
+async def handle_assignment_reminders(since: datetime = None, task_id: uuid.UUID = None):
+    """
+    Remind enrolled students who have not submitted an assignment due within 24 hours
+
+    With a `since` watermark only assignments that entered the reminder window,
+    or were created, after the last successful run are scanned.
+    """
     async with AsyncSessionLocal() as db:
-        result = await db.execute(
-            select(Assignment)
-            .where(
-                Assignment.due_date <= datetime.now(timezone.utc) + timedelta(hours=24)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        due_soon = Assignment.due_date.between(now, now + timedelta(hours=24))
+        if since is not None:
+            due_soon = and_(
+                due_soon,
+                or_(
+                    Assignment.due_date
+                    > since.astimezone(timezone.utc).replace(tzinfo=None) + timedelta(hours=24),
+                    Assignment.created_at > since,
+                ),
             )
-            .options(
-                selectinload(Assignment.submissions).selectinload(Submission.student)
+        await fan_out_notifications(
+            db,
+            enrolled_students(
+                (literal("Reminder: ") + Assignment.title + literal(" due soon!")).label("message"),
+                make_dedup_key("assignment_reminder", Assignment.id),
             )
+            .join(Assignment, Assignment.course_id == Course.id)
+            .where(
+                due_soon,
+                ~exists().where(
+                    Submission.assignment_id == Assignment.id,
+                    Submission.student_id == Enrollment.student_id,
+                ),
+            ),
+            NotificationType.ASSIGNMENT,
         )
-
-        for assignment in result.scalars():
-            for submission in assignment.submissions:
-                if not submission.submitted_at:
-                    notification = Notification(
-                        user_id=submission.student.user.id,
-                        message=f"Reminder: {assignment.title} due soon!",
-                        notification_type=NotificationType.ASSIGNMENT,
-                    )
-                    db.add(notification)
         await db.commit()
 
 
-@with_task_tracking(BackgroundTaskType.ASSIGNMENT)
+@with_task_tracking(BackgroundTaskType.ASSIGNMENT, exclusive=True)
 async def close_expired_assignments(task_id: uuid.UUID = None):
-    async with AsyncSessionLocal() as db:
-        await db.execute(
-            update(Assignment)
-            .where(Assignment.due_date < datetime.now(timezone.utc))
-            .values(status="closed")
-        )
+    """
+    Close assignments past their due date and notify students who missed them
 
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.submitted_at.is_(None))
-            .options(selectinload(Submission.assignment))
-        )
+    One UPDATE ... RETURNING closes the expired open assignments; only those
+    are then scanned, and enrolled students without a submission are notified
+    with a single set-based insert.
+    """
+    async with AsyncSessionLocal() as db:
+        closed_ids = (
+            await db.scalars(
+                update(Assignment)
+                .where(
+                    Assignment.status == AssignmentStatus.OPEN,
+                    Assignment.due_date < datetime.now(timezone.utc).replace(tzinfo=None),
+                )
+                .values(status=AssignmentStatus.CLOSED)
+                .returning(Assignment.id)
+            )
+        ).all()
 
-        for submission in result.scalars():
-            submission.status = "late"
-            notification = Notification(
-                user_id=submission.student.user.id,
-                message=f"Late submission for {submission.assignment.title}",
-                notification_type=NotificationType.DEADLINE,
+        notified = 0
+        for ids in chunked(closed_ids):
+            notified += await fan_out_notifications(
+                db,
+                enrolled_students(
+                    (literal("Late submission for ") + Assignment.title).label("message"),
+                    make_dedup_key("assignment_late", Assignment.id),
+                )
+                .join(Assignment, Assignment.course_id == Course.id)
+                .where(
+                    Assignment.id.in_(ids),
+                    ~exists().where(
+                        Submission.assignment_id == Assignment.id,
+                        Submission.student_id == Enrollment.student_id,
+                    ),
+                ),
+                NotificationType.DEADLINE,
             )
-            db.add(notification)
 
         await db.commit()
+    return {"closed": len(closed_ids), "notified": notified}
@@ -1,10 +1,25 @@
 # app/background_tasks/jobs/course_jobs.py
-from sqlalchemy import select, update, delete, and_
+from sqlalchemy import select, update, delete, insert, exists, and_, literal, union_all
 from sqlalchemy.orm import selectinload
 from app.database import AsyncSessionLocal
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+import hashlib
 import uuid
 from ..decorators import with_task_tracking
+from app.utils import (
+    chunked,
+    dialect_insert,
+    adjust_course_counts,
+    add_course_instructors,
+    remove_course_instructors,
+    remove_enrollments,
+    reconcile_course_counts,
+    enrolled_students,
+    assigned_instructors,
+    make_dedup_key,
+    fan_out_notifications
+)
 
 from app.models import (
     Course,
@@ -13,6 +28,7 @@ from app.models import (
     Instructor,
     Enrollment,
     Module,
+    ModuleStatus,
     Payment,
     Notification,
     NotificationType,
@@ -27,61 +43,92 @@ async def bulk_enroll_students(
     """
     Enroll multiple students in a course after verifying eligibility
     Handles duplicate enrollments gracefully
+
+    Works set-based, one chunk of emails at a time: a single query resolves the
+    chunk to eligible, not-yet-enrolled students (joining the paid-user set for
+    paid courses and anti-joining existing enrollments), then enrollments and
+    notifications are bulk inserted and the chunk is committed on its own.
     """
     async with AsyncSessionLocal() as db:
-        # Get the course with existing enrollments
-        course_result = await db.execute(
-            select(Course)
-            .options(selectinload(Course.payments))
-            .where(Course.id == course_id)
-        )
-        course = course_result.scalar_one()
+        course = (
+            await db.execute(
+                select(Course.id, Course.title, Course.is_free, Course.duration_days)
+                .where(Course.id == course_id)
+            )
+        ).one()
 
-        # Get existing enrolled student emails
-        existing_enrollments = {
-            enrollment.student.user.email for enrollment in course.enrollments
-        }
+        # Users with at least one completed payment for this course
+        paid_users = (
+            select(Payment.user_id)
+            .where(
+                Payment.course_id == course_id,
+                Payment.payment_status == "completed",
+            )
+            .group_by(Payment.user_id)
+            .subquery()
+        )
+        already_enrolled = exists().where(
+            Enrollment.course_id == course_id,
+            Enrollment.student_id == Student.id,
+        )
 
-        # Process new enrollments
-        new_enrollments = []
-        for email in user_emails:
-            if email in existing_enrollments:
+        enrolled_count = 0
+        emails = list(dict.fromkeys(user_emails))  # de-duplicate, keep order
+        for email_chunk in chunked(emails):
+            eligible = (
+                select(Student.id)
+                .join(User, User.id == Student.id)
+                .where(User.email.in_(email_chunk), ~already_enrolled)
+            )
+            if not course.is_free:
+                eligible = eligible.join(paid_users, paid_users.c.user_id == User.id)
+            student_ids = (await db.execute(eligible)).scalars().all()
+            if not student_ids:
                 continue
 
-            # Find user and verify student status
-            user_result = await db.execute(
-                select(User)
-                .where(User.email == email)
-                .options(selectinload(User.students))
+            start_date = datetime.now()
+            end_date = (
+                start_date + timedelta(days=course.duration_days)
+                if course.duration_days
+                else None
             )
-            user = user_result.scalar()
-
-            if user and user.students:
-                # Check for successful payment
-                payment_exists = any(
-                    p.user_id == user.id and p.payment_status == "completed"
-                    for p in course.payments
+            inserted = await db.execute(
+                dialect_insert(db, Enrollment.__table__)
+                .values(
+                    [
+                        {
+                            "student_id": student_id,
+                            "course_id": course_id,
+                            "start_date": start_date,
+                            "end_date": end_date,
+                        }
+                        for student_id in student_ids
+                    ]
                 )
-
-                if payment_exists or course.is_free:
-                    enrollment = Enrollment(
-                        course_id=course_id, student_id=user.students.id
-                    )
-                    new_enrollments.append(enrollment)
-
-                    # Send enrollment notification
-                    notification = Notification(
-                        user_id=user.id,
-                        message=f"You've been enrolled in {course.title}",
-                        notification_type=NotificationType.ENROLLMENT,
+                .on_conflict_do_nothing(index_elements=["student_id", "course_id"])
+                .returning(Enrollment.student_id)
+            )
+            # Only students whose row was actually inserted get notified
+            new_student_ids = inserted.scalars().all()
+            if new_student_ids:
+                # Student.id is the user's id
+                await db.execute(
+                    insert(Notification).values(
+                        [
+                            {
+                                "user_id": student_id,
+                                "message": f"You've been enrolled in {course.title}",
+                                "notification_type": NotificationType.ENROLLMENT,
+                            }
+                            for student_id in new_student_ids
+                        ]
                     )
-                    db.add(notification)
-
-        db.add_all(new_enrollments)
-        await db.commit()
+                )
+                await adjust_course_counts(db, course_id, enrollments=len(new_student_ids))
+            await db.commit()
+            enrolled_count += len(new_student_ids)
 
-        # Update course analytics
-        await update_course_enrollment_stats(course_id)
+    return {"enrolled": enrolled_count, "skipped": len(emails) - enrolled_count}
 
 
 @with_task_tracking(BackgroundTaskType.COURSE_DATA)
@@ -89,35 +136,36 @@ async def archive_completed_courses():
     """Archive courses that ended over 30 days ago and their related content"""
     async with AsyncSessionLocal() as db:
         # Find courses to archive
-        result = await db.execute(
-            select(Course)
-            .where(
-                and_(
-                    Course.end_date < datetime.now(timezone.utc) - timedelta(days=30),
-                    Course.status == "completed",
+        course_ids = (
+            await db.scalars(
+                select(Course.id).where(
+                    and_(
+                        Course.end_date < datetime.now(timezone.utc) - timedelta(days=30),
+                        Course.status == "completed",
+                    )
                 )
             )
-            .options(selectinload(Course.modules))
-        )
+        ).all()
 
-        for course in result.scalars():
-            course.status = "archived"
+        for ids in chunked(course_ids):
+            await db.execute(
+                update(Course).where(Course.id.in_(ids)).values(status="archived")
+            )
 
             # Archive modules
             await db.execute(
-                update(Module)
-                .where(Module.course_id == course.id)
-                .values(status="archived")
+                update(Module).where(Module.course_id.in_(ids)).values(status="archived")
             )
 
             # Notify instructors
-            for instructor in course.instructors:
-                notification = Notification(
-                    user_id=instructor.id,
-                    message=f"Course archived: {course.title}",
-                    notification_type=NotificationType.COURSE_UPDATE,
-                )
-                db.add(notification)
+            await fan_out_notifications(
+                db,
+                assigned_instructors(
+                    (literal("Course archived: ") + Course.title).label("message"),
+                    make_dedup_key("course_archived", Course.id),
+                ).where(Course.id.in_(ids)),
+                NotificationType.COURSE_UPDATE,
+            )
 
         await db.commit()
 
@@ -128,120 +176,111 @@ async def manage_course_instructors(
     instructor_ids: list[uuid.UUID],
     action: str,  # 'add' or 'remove'
 ):
-    """Bulk add or remove instructors from a course with validation"""
+    """
+    Bulk add or remove instructors from a course with validation
+
+    Assignments change with a single statement and the course's
+    instructor_count is adjusted in the same transaction.
+    """
     async with AsyncSessionLocal() as db:
-        # Get course with existing instructors
-        course_result = await db.execute(
-            select(Course)
-            .options(selectinload(Course.instructors))
-            .where(Course.id == course_id)
-        )
-        course = course_result.scalar_one()
+        course_title = (
+            await db.execute(select(Course.title).where(Course.id == course_id))
+        ).scalar_one()
 
-        # Get target instructors
-        instructors_result = await db.execute(
-            select(Instructor).where(Instructor.id.in_(instructor_ids))
-        )
-        target_instructors = instructors_result.scalars().all()
+        # Only existing instructors can be assigned
+        target_ids = (
+            await db.scalars(select(Instructor.id).where(Instructor.id.in_(instructor_ids)))
+        ).all()
 
         if action == "add":
-            for instructor in target_instructors:
-                if instructor not in course.instructors:
-                    course.instructors.append(instructor)
-                    # Send notification
-                    notification = Notification(
-                        user_id=instructor.id,
-                        message=f"Added as instructor to {course.title}",
-                        notification_type=NotificationType.INSTRUCTOR,
-                    )
-                    db.add(notification)
-
+            changed = await add_course_instructors(db, course_id, target_ids)
+            message = f"Added as instructor to {course_title}"
         elif action == "remove":
-            for instructor in target_instructors:
-                if instructor in course.instructors:
-                    course.instructors.remove(instructor)
-                    # Send notification
-                    notification = Notification(
-                        user_id=instructor.id,
-                        message=f"Removed from {course.title} instructors",
-                        notification_type=NotificationType.INSTRUCTOR,
-                    )
-                    db.add(notification)
+            changed = await remove_course_instructors(db, course_id, target_ids)
+            message = f"Removed from {course_title} instructors"
+        else:
+            changed = []
+
+        if changed:
+            await db.execute(
+                insert(Notification),
+                [
+                    {
+                        "user_id": instructor_id,
+                        "message": message,
+                        "notification_type": NotificationType.INSTRUCTOR,
+                    }
+                    for instructor_id in changed
+                ],
+            )
 
         await db.commit()
-        await update_course_instructor_stats(course_id)
 
 
-@with_task_tracking(BackgroundTaskType.COURSE_DATA)
-async def process_course_expirations():
-    """Notify users about upcoming course expirations"""
+@with_task_tracking(BackgroundTaskType.COURSE_DATA, exclusive=True)
+async def process_course_expirations(since: datetime = None):
+    """
+    Notify users about upcoming course expirations
+
+    Courses are reported once, when they come within 7 days of their end
+    date. Scheduled runs pick up every course that crossed that horizon since
+    the last successful run, so a missed day is caught up rather than skipped.
+    """
     async with AsyncSessionLocal() as db:
-        # Find courses ending in 7 days
-        result = await db.execute(
-            select(Course)
-            .where(
-                and_(
-                    Course.end_date.between(
-                        datetime.now(timezone.utc) + timedelta(days=6),
-                        datetime.now(timezone.utc) + timedelta(days=7),
-                    ),
-                    Course.status == "active",
-                )
-            )
-            .options(
-                selectinload(Course.enrollments)
-                .selectinload(Enrollment.student)
-                .selectinload(Student.user)
-            )
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(days=7)
+        # Courses ending in 7 days, or that got within 7 days since the last run
+        # (but have not ended yet)
+        window_start = (
+            now + timedelta(days=6) if since is None else max(since + timedelta(days=7), now)
+        )
+        ending_soon = and_(
+            Course.end_date > window_start,
+            Course.end_date <= horizon,
+            Course.status == "active",
+        )
+        columns = (
+            (literal("Course ending soon: ") + Course.title).label("message"),
+            make_dedup_key("course_ending", Course.id),
         )
 
-        for course in result.scalars():
-            # Notify students
-            for enrollment in course.enrollments:
-                notification = Notification(
-                    user_id=enrollment.student.user.id,
-                    message=f"Course ending soon: {course.title}",
-                    notification_type=NotificationType.DEADLINE,
-                )
-                db.add(notification)
-
-            # Notify instructors
-            for instructor in course.instructors:
-                notification = Notification(
-                    user_id=instructor.id,
-                    message=f"Course ending soon: {course.title}",
-                    notification_type=NotificationType.DEADLINE,
-                )
-                db.add(notification)
+        # Notify students and instructors
+        await fan_out_notifications(
+            db,
+            union_all(
+                enrolled_students(*columns).where(ending_soon),
+                assigned_instructors(*columns).where(ending_soon),
+            ),
+            NotificationType.DEADLINE,
+        )
 
         await db.commit()
 
 
-@with_task_tracking(BackgroundTaskType.DATA_CLEANUP)
-async def reconcile_payments():
+@with_task_tracking(BackgroundTaskType.DATA_CLEANUP, exclusive=True)
+async def reconcile_payments(since: datetime = None):
     """Clean up unpaid enrollments after 7 days"""
     async with AsyncSessionLocal() as db:
         # Find pending payments older than 7 days
+        stale = and_(
+            Payment.payment_status == "pending",
+            Payment.created_at < datetime.now(timezone.utc) - timedelta(days=7),
+        )
+        if since is not None:
+            # Older ones went stale before the last run and were handled by it
+            stale = and_(stale, Payment.created_at >= since - timedelta(days=7))
         result = await db.execute(
             select(Payment)
-            .where(
-                and_(
-                    Payment.payment_status == "pending",
-                    Payment.created_at < datetime.now(timezone.utc) - timedelta(days=7),
-                )
-            )
+            .where(stale)
             .options(selectinload(Payment.course), selectinload(Payment.user))
         )
 
         for payment in result.scalars():
-            # Remove enrollment if exists
-            await db.execute(
-                delete(Enrollment).where(
-                    and_(
-                        Enrollment.course_id == payment.course_id,
-                        Enrollment.student_id == payment.user.student.id,
-                    )
-                )
+            # Remove enrollment if exists (a student's id is their user id)
+            await remove_enrollments(
+                db,
+                Enrollment.course_id == payment.course_id,
+                Enrollment.student_id == payment.user_id,
             )
 
             # Update payment status
@@ -258,83 +297,100 @@ async def reconcile_payments():
         await db.commit()
 
 
-async def update_course_enrollment_stats(course_id: uuid.UUID):
-    """Update course enrollment metrics"""
+@with_task_tracking(BackgroundTaskType.COURSE_DATA, exclusive=True)
+async def reconcile_course_stats():
+    """Repair drift in the incrementally maintained course counters"""
     async with AsyncSessionLocal() as db:
-        # Get enrollment count
-        enrollments_count = await db.scalar(
-            select(Enrollment).where(Enrollment.course_id == course_id).count()
-        )
-
-        # Update course statistics
-        await db.execute(
-            update(Course)
-            .where(Course.id == course_id)
-            .values(enrollment_count=enrollments_count)
-        )
-
+        repaired = await reconcile_course_counts(db)
         await db.commit()
+    return {"repaired": repaired}
 
 
-async def update_course_instructor_stats(course_id: uuid.UUID):
-    """Update course instructor count"""
+async def update_course_stats(course_id: uuid.UUID):
+    """Recount one course's enrollment and instructor counters"""
     async with AsyncSessionLocal() as db:
-        instructor_count = await db.scalar(
-            select(Course.instructors).where(Course.id == course_id).count()
-        )
+        await reconcile_course_counts(db, course_id)
+        await db.commit()
 
-        await db.execute(
-            update(Course)
-            .where(Course.id == course_id)
-            .values(instructor_count=instructor_count)
-        )
 
-        await db.commit()
+# Module titles listed in a publication digest before it is summarised
+DIGEST_MAX_TITLES = 5
 
 
-@with_task_tracking(BackgroundTaskType.COURSE_DATA)
+@with_task_tracking(BackgroundTaskType.COURSE_DATA, exclusive=True)
 async def publish_scheduled_modules():
-    """Activate modules based on their scheduled publish dates"""
+    """
+    Activate modules based on their scheduled publish dates
+
+    All due modules are activated by one UPDATE ... RETURNING. The returned
+    modules are grouped by course and every enrolled student receives a
+    single digest per course, all in the same transaction.
+    """
     async with AsyncSessionLocal() as db:
-        # Assuming Module has publish_date and status fields
-        result = await db.execute(
-            select(Module).where(
-                and_(
-                    Module.publish_date <= datetime.now(), Module.status == "scheduled"
+        published = (
+            await db.execute(
+                update(Module)
+                .where(
+                    Module.status == ModuleStatus.SCHEDULED,
+                    Module.publish_date <= datetime.now(timezone.utc),
                 )
+                .values(status=ModuleStatus.ACTIVE)
+                .returning(Module.id, Module.course_id, Module.title, Module.order)
             )
+        ).all()
+        if not published:
+            return {"published": 0, "notified": 0}
+
+        by_course = defaultdict(list)
+        for module in sorted(published, key=lambda m: (m.order is None, m.order)):
+            by_course[module.course_id].append(module)
+        course_titles = dict(
+            (
+                await db.execute(
+                    select(Course.id, Course.title).where(Course.id.in_(by_course))
+                )
+            ).all()
         )
 
-        for module in result.scalars():
-            module.status = "active"
-            # Notify course participants
-            await notify_module_publication(module.id)
+        notified = 0
+        for course_id, modules in by_course.items():
+            module_ids = sorted(str(module.id) for module in modules)
+            notified += await fan_out_notifications(
+                db,
+                enrolled_students().where(Course.id == course_id),
+                NotificationType.COURSE_UPDATE,
+                message=module_digest(course_titles.get(course_id, ""), modules),
+                dedup_key="modules_published:"
+                + hashlib.sha1(",".join(module_ids).encode()).hexdigest(),
+                additional_data={"course_id": str(course_id), "module_ids": module_ids},
+            )
 
         await db.commit()
+    return {"published": len(published), "notified": notified}
+
+
+def module_digest(course_title: str, modules: list) -> str:
+    """Build the notification text for the modules published in one course"""
+    if len(modules) == 1:
+        return f"New module published: {modules[0].title}"
+    titles = ", ".join(module.title for module in modules[:DIGEST_MAX_TITLES])
+    if len(modules) > DIGEST_MAX_TITLES:
+        titles += f" and {len(modules) - DIGEST_MAX_TITLES} more"
+    return f"{len(modules)} new modules published in {course_title}: {titles}"
 
 
 async def notify_module_publication(module_id: uuid.UUID):
     """Notify students when a new module is published"""
     async with AsyncSessionLocal() as db:
-        # Get module with course and enrollments
-        module_result = await db.execute(
-            select(Module)
-            .options(
-                selectinload(Module.course)
-                .selectinload(Course.enrollments)
-                .selectinload(Enrollment.student)
-                .selectinload(Student.user)
+        await fan_out_notifications(
+            db,
+            enrolled_students(
+                (literal("New module published: ") + Module.title).label("message"),
+                make_dedup_key("module_published", Module.id),
             )
-            .where(Module.id == module_id)
+            .join(Module, Module.course_id == Course.id)
+            .where(Module.id == module_id),
+            NotificationType.COURSE_UPDATE,
         )
-        module = module_result.scalar_one()
-
-        for enrollment in module.course.enrollments:
-            notification = Notification(
-                user_id=enrollment.student.user.id,
-                message=f"New module published: {module.title}",
-                notification_type=NotificationType.COURSE_UPDATE,
-            )
-            db.add(notification)
 
         await db.commit()
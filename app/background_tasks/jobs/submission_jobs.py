@@ -1,10 +1,12 @@
 # app/background_tasks/jobs/submission_jobs.py
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from difflib import SequenceMatcher
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+from sqlalchemy import update, insert
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import zlib
 from typing import List, Dict, Any
 from app.models import (
     Submission,
@@ -17,102 +19,363 @@ from app.models import (
 import uuid
 from app.database import AsyncSessionLocal
 from ..decorators import with_task_tracking
+from .. import alignment
+from ..alignment import align_pair
+from app.utils import (
+    preprocess_content,
+    index_submission,
+    find_candidates,
+    MAX_CANDIDATES,
+    logger,
+)
+
+
+# Stage 1: winnowing fingerprints (k-gram hashes, minimum per window)
+WINNOW_K = 8
+WINNOW_WINDOW = 8
+# Pairs below this fingerprint overlap are not aligned at all (unless their
+# cosine score alone already reaches the alert threshold). Same-language
+# documents share many character n-grams, so cosine is a poor prefilter.
+SHORTLIST_THRESHOLD = 0.25
+# Combined score above which instructors and the student are alerted
+ALERT_THRESHOLD = 0.75
+# Rows of the all-pairs score matrices computed at a time, bounding the
+# dense scores held in memory to SIMILARITY_BLOCK_ROWS x submissions
+SIMILARITY_BLOCK_ROWS = 256
+
+
+def winnow(text: str, k: int = WINNOW_K, window: int = WINNOW_WINDOW) -> set[int]:
+    """Select winnowing fingerprints: the smallest k-gram hash in each window"""
+    hashes = [zlib.crc32(text[i : i + k].encode()) for i in range(len(text) - k + 1)]
+    if len(hashes) <= window:
+        return set(hashes)
+    # Window minima over `window` shifted views of the hash list
+    return set(map(min, zip(*(hashes[i:] for i in range(window)))))
+
+
+def fingerprint_overlap(a: set[int], b: set[int]) -> float:
+    """Containment of the smaller fingerprint set in the larger one"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
 
 
 @with_task_tracking(BackgroundTaskType.PLAGIARISM)
-async def check_submission_plagiarism(submission_id: uuid.UUID) -> Dict[str, Any]:
+async def check_submission_plagiarism(
+    submission_id: uuid.UUID, task_id: uuid.UUID = None
+) -> Dict[str, Any]:
     """
     Enhanced plagiarism detection with:
     - Text normalization
+    - Candidate lookup in the assignment's fingerprint index
     - Multiple similarity metrics
     - Match highlighting
     - Threshold-based alerts
     """
     async with AsyncSessionLocal() as db:
-        # Get submission with full relationships
         submission_result = await db.execute(
-            select(Submission)
-            .options(
-                selectinload(Submission.assignment)
-                .selectinload(Assignment.submissions)
-                .selectinload(Submission.student),
-                selectinload(Submission.student),
-            )
-            .where(Submission.id == submission_id)
+            select(Submission).where(Submission.id == submission_id)
         )
         submission = submission_result.scalar_one()
 
-        # Get all other submissions for this assignment
-        other_submissions = [
-            s
-            for s in submission.assignment.submissions
-            if s.id != submission_id and s.content
-        ]
+        # Index the submission if it predates the index, then look up only the
+        # submissions that share enough fingerprints with it
+        hashes = await index_submission(
+            db, submission.id, submission.assignment_id, submission.content
+        )
+        candidates = await find_candidates(
+            db, submission.id, submission.assignment_id, hashes
+        )
+
+        other_submissions = []
+        if candidates:
+            other_result = await db.execute(
+                select(Submission).where(
+                    Submission.id.in_(candidates.keys()),
+                    Submission.content.is_not(None),
+                )
+            )
+            other_submissions = other_result.scalars().all()
 
         # Preprocess content
         current_content = preprocess_content(submission.content)
         other_contents = [preprocess_content(s.content) for s in other_submissions]
 
-        # Calculate similarities
-        similarity_report = calculate_similarity_report(
-            current_content, other_contents, other_submissions
+        # Calculate similarities; CPU-bound, so kept off the event loop shared
+        # with the worker's other jobs
+        similarity_report = await asyncio.to_thread(
+            calculate_similarity_report, current_content, other_contents, other_submissions
         )
+        similarity_report["candidates_checked"] = len(other_submissions)
 
         # Update submission with results
         submission.plagiarism_score = similarity_report["max_score"]
         submission.plagiarism_report = similarity_report
 
-        # Handle high similarity cases
-        if submission.plagiarism_score > 0.75:
-            await handle_plagiarism_alert(submission)
-
         await db.commit()
+
+    # Handle high similarity cases
+    if submission.plagiarism_score > ALERT_THRESHOLD:
+        await handle_plagiarism_alert(submission)
     return submission.plagiarism_report
 
 
-def preprocess_content(content: str) -> str:
-    """Normalize content for better comparison"""
-    if not content:
-        return ""
+@with_task_tracking(BackgroundTaskType.PLAGIARISM)
+async def check_assignment_plagiarism(
+    assignment_id: uuid.UUID, task_id: uuid.UUID = None
+) -> Dict[str, Any]:
+    """
+    Assignment-wide sweep: score every submission against every other once.
+
+    - One TF-IDF fit; block-wise sparse products give all pairwise cosines
+      and winnowing fingerprint overlaps, reduced per row to its candidates
+    - Shortlisted pairs are aligned once each across a process pool
+    - Scores and reports are written back in a single bulk UPDATE
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Submission.id, Submission.student_id, Submission.content).where(
+                Submission.assignment_id == assignment_id,
+                Submission.content.is_not(None),
+            )
+        )
+        rows = result.all()
+        if len(rows) < 2:
+            return {"checked": len(rows), "flagged": 0}
+
+        texts = [preprocess_content(row.content) for row in rows]
+        # CPU-bound: kept off the event loop shared with the worker's other jobs
+        shortlist, candidates = await asyncio.to_thread(pairwise_candidates, texts)
+        alignments = await asyncio.to_thread(align_pairs, texts, shortlist)
+
+        n = len(rows)
+        reports = []
+        for i, row in enumerate(rows):
+            similarities = []
+            for j, (cosine, overlap) in candidates[i].items():
+                other = rows[j]
+                pair = alignments.get((i, j)) if i < j else alignments.get((j, i))
+                # Alignment was computed from the lower index's side; mirror it
+                blocks = pair["blocks"] if pair and i < j else [
+                    {
+                        "source_start": b["match_start"],
+                        "source_end": b["match_end"],
+                        "match_start": b["source_start"],
+                        "match_end": b["source_end"],
+                        "content": b["content"],
+                    }
+                    for b in (pair["blocks"] if pair else [])
+                ]
+                ratio = pair["ratio"] if pair else 0.0
+                similarities.append(
+                    {
+                        "submission_id": str(other.id),
+                        "student_id": str(other.student_id),
+                        "similarity_scores": {
+                            "cosine": cosine,
+                            "fingerprint": overlap,
+                            "sequence": ratio,
+                            "combined": max(cosine, ratio),
+                        },
+                        "aligned": pair is not None,
+                        "alignment_truncated": pair["truncated"] if pair else False,
+                        "matched_sections": blocks,
+                    }
+                )
+            # Keep reports bounded on large assignments
+            similarities.sort(key=lambda s: s["similarity_scores"]["combined"], reverse=True)
+            similarities = similarities[:MAX_CANDIDATES]
+            max_score = similarities[0]["similarity_scores"]["combined"] if similarities else 0.0
+            reports.append(
+                {
+                    "id": row.id,
+                    "plagiarism_score": max_score,
+                    "plagiarism_report": {
+                        "max_score": max_score,
+                        "similarities": similarities,
+                        "techniques_used": [
+                            "TF-IDF Cosine",
+                            "Winnowing Fingerprints",
+                            "Sequence Matching",
+                        ],
+                        "threshold": ALERT_THRESHOLD,
+                        "content_length": len(texts[i]),
+                        "candidates_checked": n - 1,
+                        "mode": "assignment_sweep",
+                    },
+                }
+            )
 
-    # Remove code comments and special characters
-    content = re.sub(r"#.*|\/\/.*|\/\*.*?\*\/", "", content, flags=re.DOTALL)
-    # Normalize whitespace and lowercase
-    return re.sub(r"\s+", " ", content).strip().lower()
+        # ORM bulk UPDATE by primary key: one executemany statement
+        await db.execute(update(Submission), reports)
+        await db.commit()
+
+    flagged = [
+        (report["id"], row.student_id, report["plagiarism_score"])
+        for report, row in zip(reports, rows)
+        if report["plagiarism_score"] > ALERT_THRESHOLD
+    ]
+    if flagged:
+        await handle_plagiarism_alerts(assignment_id, flagged)
+    return {"checked": n, "aligned_pairs": len(shortlist), "flagged": len(flagged)}
+
+
+def pairwise_candidates(texts: List[str], keep: int = MAX_CANDIDATES):
+    """
+    Score all pairs by TF-IDF cosine and winnowing overlap, block by block.
+
+    Each block of rows comes from one sparse product against all documents
+    and is reduced before the next: pairs above either threshold are
+    shortlisted for alignment, and every row keeps its `keep` best cosine
+    scores (np.argpartition) plus its shortlisted pairs. A row's final
+    report, ranked by max(cosine, alignment ratio), only ever draws from
+    those, so nothing n x n is kept.
+
+    Returns:
+        tuple: Shortlisted `(i, j)` pairs with `i < j`, and per row a dict of
+        candidate column -> (cosine, fingerprint overlap).
+    """
+    # scikit-learn/scipy take over a second to import; only plagiarism runs pay it
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    n = len(texts)
+    vectorizer = TfidfVectorizer(ngram_range=(3, 5), analyzer="char_wb")
+    # Rows are L2-normalized, so X @ X.T is the cosine similarity matrix
+    tfidf_matrix = vectorizer.fit_transform(texts)
+    tfidf_transposed = tfidf_matrix.T.tocsr()
+
+    # Binary document x fingerprint matrix; F @ F.T counts shared fingerprints
+    vocabulary: Dict[int, int] = {}
+    indptr, indices = [0], []
+    for text in texts:
+        indices.extend(vocabulary.setdefault(h, len(vocabulary)) for h in winnow(text))
+        indptr.append(len(indices))
+    fingerprints = csr_matrix(
+        (np.ones(len(indices), dtype="int32"), indices, indptr),
+        shape=(n, max(len(vocabulary), 1)),
+    )
+    fingerprints_transposed = fingerprints.T.tocsr()
+    sizes = np.diff(fingerprints.indptr)
+
+    shortlist: List[tuple[int, int]] = []
+    candidates: List[Dict[int, tuple[float, float]]] = []
+    for start in range(0, n, SIMILARITY_BLOCK_ROWS):
+        stop = min(start + SIMILARITY_BLOCK_ROWS, n)
+        rows = np.arange(start, stop)
+        cosine = (tfidf_matrix[start:stop] @ tfidf_transposed).toarray()
+        shared = (fingerprints[start:stop] @ fingerprints_transposed).toarray()
+        overlap = shared / np.minimum(sizes[rows, None], sizes[None, :]).clip(min=1)
+        # A document is not a candidate against itself
+        cosine[rows - start, rows] = -1.0
+        overlap[rows - start, rows] = 0.0
+
+        flagged = (overlap >= SHORTLIST_THRESHOLD) | (cosine >= ALERT_THRESHOLD)
+        if keep < n - 1:
+            best = np.argpartition(-cosine, keep, axis=1)[:, :keep]
+        else:
+            best = np.broadcast_to(np.arange(n), (len(rows), n))
+        for local, i in enumerate(rows.tolist()):
+            matches = np.flatnonzero(flagged[local])
+            shortlist.extend((i, j) for j in matches[matches > i].tolist())
+            columns = np.union1d(best[local], matches)
+            columns = columns[columns != i]
+            candidates.append(
+                {
+                    j: (float(cosine[local, j]), float(overlap[local, j]))
+                    for j in columns.tolist()
+                }
+            )
+    return shortlist, candidates
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def align_pairs(texts: List[str], pairs: List[tuple[int, int]]) -> Dict[tuple, Dict]:
+    """
+    Align shortlisted pairs, spread across a process pool sized to the cores.
+
+    Falls back to aligning in-process when the pool would not help or cannot
+    be created (prefork Celery children are daemonic and may not fork).
+    Pool processes come from a forkserver rather than a fork of this
+    process, which runs the event loop and logging threads; they only import
+    the alignment module.
+    """
+    if not pairs:
+        return {}
+    processes = min(_available_cores(), len(pairs))
+    if processes < 2 or multiprocessing.current_process().daemon:
+        if processes >= 2:
+            logger.warning("Daemonic worker process, aligning plagiarism pairs serially")
+        return {pair: align_pair(texts[pair[0]], texts[pair[1]]) for pair in pairs}
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([alignment.__name__])
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=context,
+        initializer=alignment.init_alignment_worker,
+        initargs=(texts,),
+    ) as pool:
+        chunksize = max(len(pairs) // (processes * 4), 1)
+        return dict(zip(pairs, pool.map(alignment.align_indices, pairs, chunksize=chunksize)))
 
 
 def calculate_similarity_report(
     source_text: str, target_texts: List[str], submissions: List[Submission]
 ) -> Dict[str, Any]:
-    """Calculate multiple similarity metrics and generate report"""
+    """
+    Calculate multiple similarity metrics and generate report
+
+    Cheap signals (TF-IDF cosine and winnowing fingerprint overlap) are computed
+    for every pair; exact alignment only runs on the pairs they shortlist.
+    """
     if not target_texts:
         return {"max_score": 0.0, "similarities": [], "techniques_used": []}
 
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     # TF-IDF Cosine Similarity
     vectorizer = TfidfVectorizer(ngram_range=(3, 5), analyzer="char_wb")
     tfidf_matrix = vectorizer.fit_transform([source_text] + target_texts)
     cosine_sims = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])[0]
 
-    # Sequence Matcher
-    sequence_sims = [
-        SequenceMatcher(None, source_text, text).ratio() for text in target_texts
+    # Winnowing fingerprint overlap
+    source_fingerprints = winnow(source_text)
+    overlaps = [
+        fingerprint_overlap(source_fingerprints, winnow(text)) for text in target_texts
     ]
 
     # Combine results
     similarities = []
     for idx, sub in enumerate(submissions):
+        cosine = float(cosine_sims[idx])
+        overlap = overlaps[idx]
+        shortlisted = overlap >= SHORTLIST_THRESHOLD or cosine >= ALERT_THRESHOLD
+        alignment = (
+            align_pair(source_text, target_texts[idx])
+            if shortlisted
+            else {"ratio": 0.0, "truncated": False, "blocks": []}
+        )
         similarities.append(
             {
                 "submission_id": str(sub.id),
-                "student_id": str(sub.student.id),
+                "student_id": str(sub.student_id),
                 "similarity_scores": {
-                    "cosine": float(cosine_sims[idx]),
-                    "sequence": float(sequence_sims[idx]),
-                    "combined": max(cosine_sims[idx], sequence_sims[idx]),
+                    "cosine": cosine,
+                    "fingerprint": overlap,
+                    "sequence": alignment["ratio"],
+                    "combined": max(cosine, alignment["ratio"]),
                 },
-                "matched_sections": find_matching_blocks(
-                    source_text, target_texts[idx]
-                ),
+                "aligned": shortlisted,
+                "alignment_truncated": alignment["truncated"],
+                "matched_sections": alignment["blocks"],
             }
         )
 
@@ -123,65 +386,71 @@ def calculate_similarity_report(
     return {
         "max_score": max_score,
         "similarities": similarities,
-        "techniques_used": ["TF-IDF Cosine", "Sequence Matching"],
-        "threshold": 0.75,
+        "techniques_used": ["TF-IDF Cosine", "Winnowing Fingerprints", "Sequence Matching"],
+        "threshold": ALERT_THRESHOLD,
         "content_length": len(source_text),
     }
 
 
 def find_matching_blocks(a: str, b: str, min_length: int = 50) -> List[Dict]:
     """Identify significant matching text sections"""
-    matcher = SequenceMatcher(None, a, b)
-    return [
-        {
-            "source_start": m.a,
-            "source_end": m.a + m.size,
-            "match_start": m.b,
-            "match_end": m.b + m.size,
-            "content": a[m.a : m.a + m.size],
-        }
-        for m in matcher.get_matching_blocks()
-        if m.size > min_length
-    ]
+    return align_pair(a, b, min_length=min_length)["blocks"]
 
 
 async def handle_plagiarism_alert(submission: Submission):
     """Create notifications for detected plagiarism"""
+    await handle_plagiarism_alerts(
+        submission.assignment_id,
+        [(submission.id, submission.student_id, submission.plagiarism_score)],
+    )
+
+
+async def handle_plagiarism_alerts(
+    assignment_id: uuid.UUID, flagged: List[tuple[uuid.UUID, uuid.UUID, float]]
+):
+    """Notify instructors and students for (submission_id, student_id, score) entries"""
     async with AsyncSessionLocal() as db:
-        # Notify instructors
         assignment_result = await db.execute(
             select(Assignment)
             .options(selectinload(Assignment.course).selectinload(Course.instructors))
-            .where(Assignment.id == submission.assignment_id)
+            .where(Assignment.id == assignment_id)
         )
         assignment = assignment_result.scalar_one()
 
-        for instructor in assignment.course.instructors:
-            notification = Notification(
-                user_id=instructor.id,
-                notification_type=NotificationType.PLAGIARISM,
-                message=f"Potential plagiarism detected in submission for {assignment.title}",
-                additional_data={
-                    "submission_id": str(submission.id),
-                    "student_id": str(submission.student.id),
-                    "score": submission.plagiarism_score,
-                    "assignment_id": str(assignment.id),
-                },
+        notifications = []
+        for submission_id, student_id, score in flagged:
+            # Notify instructors
+            for instructor in assignment.course.instructors:
+                notifications.append(
+                    {
+                        "user_id": instructor.id,
+                        "notification_type": NotificationType.PLAGIARISM,
+                        "message": f"Potential plagiarism detected in submission for {assignment.title}",
+                        "additional_data": {
+                            "submission_id": str(submission_id),
+                            "student_id": str(student_id),
+                            "score": score,
+                            "assignment_id": str(assignment.id),
+                        },
+                    }
+                )
+
+            # Notify student (Student.id is the user's id)
+            notifications.append(
+                {
+                    "user_id": student_id,
+                    "notification_type": NotificationType.PLAGIARISM,
+                    "message": f"Your submission for {assignment.title} requires review",
+                    "additional_data": {
+                        "submission_id": str(submission_id),
+                        "assignment_id": str(assignment.id),
+                        "score": score,
+                    },
+                }
             )
-            db.add(notification)
-
-        # Notify student
-        student_notification = Notification(
-            user_id=submission.student.user.id,
-            notification_type=NotificationType.PLAGIARISM,
-            message=f"Your submission for {assignment.title} requires review",
-            additional_data={
-                "submission_id": str(submission.id),
-                "assignment_id": str(assignment.id),
-                "score": submission.plagiarism_score,
-            },
-        )
-        db.add(student_notification)
+
+        await db.execute(insert(Notification), notifications)
+        await db.commit()
 
 
 @with_task_tracking(BackgroundTaskType.GRADE)
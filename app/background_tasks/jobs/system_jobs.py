@@ -1,39 +1,152 @@
 # app/background_tasks/jobs/system_jobs.py
-from app.models import Submission, BackgroundTask
 from app.database import AsyncSessionLocal
 from datetime import datetime, timedelta, timezone
 from ..decorators import with_task_tracking
 import uuid
-from sqlalchemy.orm import selectinload
-from app.models import Submission, Notification, BackgroundTaskType, NotificationType
-from sqlalchemy import delete, select
+from app.models import (
+    Submission,
+    Assignment,
+    Notification,
+    BackgroundTask,
+    BackgroundTaskType,
+    NotificationType,
+)
+from app.utils import BULK_CHUNK_SIZE, sql_uuid
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-@with_task_tracking(BackgroundTaskType.DATA_CLEANUP)
-async def clean_old_submissions(days=365, task_id: uuid.UUID = None):
+# Key under which clean_old_submissions keeps its progress in the task's parameters
+CLEANUP_PROGRESS_KEY = "submission_cleanup"
+
+
+@with_task_tracking(BackgroundTaskType.DATA_CLEANUP, exclusive=True)
+async def clean_old_submissions(
+    days=365, batch_size: int = BULK_CHUNK_SIZE, task_id: uuid.UUID = None
+):
+    """
+    Delete submissions older than `days` and notify their students.
+
+    Old submissions are walked in primary-key chunks of `batch_size`. Each
+    chunk's notifications are written with a single INSERT ... SELECT, then the
+    chunk is deleted and committed on its own, so row locks are held briefly
+    and memory stays flat. Progress is saved with every chunk; if the previous
+    run was interrupted, this one resumes from its cutoff and last key.
+    """
     async with AsyncSessionLocal() as db:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        parameters = {}
+        if task_id is not None:
+            parameters = (
+                await db.scalar(
+                    select(BackgroundTask.parameters).where(BackgroundTask.id == task_id)
+                )
+            ) or {}
+        progress = await _load_cleanup_progress(db, task_id) or {
+            "cutoff": (datetime.now(timezone.utc) - timedelta(days=days))
+            .replace(tzinfo=None)
+            .isoformat(),
+            "last_id": None,
+            "deleted": 0,
+            "done": False,
+        }
+        cutoff = datetime.fromisoformat(progress["cutoff"])
 
-        # Get submissions to delete
-        result = await db.execute(
-            select(Submission)
-            .where(Submission.submitted_at < cutoff)
-            .options(selectinload(Submission.student))
-        )
+        while True:
+            stmt = (
+                select(Submission.id)
+                .where(Submission.submitted_at < cutoff)
+                .order_by(Submission.id)
+                .limit(batch_size)
+            )
+            if progress["last_id"]:
+                stmt = stmt.where(Submission.id > uuid.UUID(progress["last_id"]))
+            ids = (await db.scalars(stmt)).all()
+            if not ids:
+                break
 
-        deleted_count = 0
-        for submission in result.scalars():
-            notification = Notification(
-                user_id=submission.student.user.id,
-                message=f"Submission archived: {submission.assignment.title}",
-                notification_type=NotificationType.SYSTEM,
+            await db.execute(
+                insert(Notification).from_select(
+                    [
+                        "id",
+                        "user_id",
+                        "message",
+                        "notification_type",
+                        "is_read",
+                        "created_at",
+                    ],
+                    select(
+                        sql_uuid(db),
+                        Submission.student_id,
+                        literal("Submission archived: ") + Assignment.title,
+                        literal(NotificationType.SYSTEM, Notification.notification_type.type),
+                        literal(False),
+                        func.now(),
+                    )
+                    .join(Assignment, Assignment.id == Submission.assignment_id)
+                    .where(Submission.id.in_(ids), Submission.student_id.isnot(None)),
+                )
             )
-            db.add(notification)
-            deleted_count += 1
+            await db.execute(delete(Submission).where(Submission.id.in_(ids)))
 
-        await db.execute(delete(Submission).where(Submission.submitted_at < cutoff))
+            progress["last_id"] = str(ids[-1])
+            progress["deleted"] += len(ids)
+            await _save_cleanup_progress(db, task_id, parameters, progress)
+            await db.commit()
+
+        progress["done"] = True
+        await _save_cleanup_progress(db, task_id, parameters, progress)
         await db.commit()
-    return f"Deleted {deleted_count} old submissions"
+    return f"Deleted {progress['deleted']} old submissions"
+
+
+async def _load_cleanup_progress(db: AsyncSession, task_id: uuid.UUID | None) -> dict | None:
+    """
+    Return the progress of the last clean_old_submissions run if it did not finish.
+
+    Runs are found by task name: other DATA_CLEANUP jobs (such as the hourly
+    payment reconciliation) share the task type. The interrupted run is marked
+    as taken over in the current transaction, so it is only resumed once even
+    if several runs start within the same second.
+    """
+    result = await db.execute(
+        select(BackgroundTask.id, BackgroundTask.parameters)
+        .where(
+            BackgroundTask.name == clean_old_submissions.name,
+            BackgroundTask.id != task_id,
+        )
+        .order_by(BackgroundTask.created_at.desc())
+    )
+    for previous_id, parameters in result:
+        progress = (parameters or {}).get(CLEANUP_PROGRESS_KEY)
+        if progress is None:
+            continue
+        if progress["done"]:
+            return None
+        await db.execute(
+            update(BackgroundTask)
+            .where(BackgroundTask.id == previous_id)
+            .values(
+                parameters={
+                    **parameters,
+                    CLEANUP_PROGRESS_KEY: {**progress, "done": True, "resumed_by": str(task_id)},
+                }
+            )
+        )
+        return progress
+    return None
+
+
+async def _save_cleanup_progress(
+    db: AsyncSession, task_id: uuid.UUID | None, parameters: dict, progress: dict
+):
+    """Store progress in the task's parameters as part of the current transaction."""
+    if task_id is None:
+        return
+    await db.execute(
+        update(BackgroundTask)
+        .where(BackgroundTask.id == task_id)
+        .values(parameters={**parameters, CLEANUP_PROGRESS_KEY: dict(progress)})
+    )
 
 
 @with_task_tracking(BackgroundTaskType.DATA_BACKUP)
@@ -0,0 +1,93 @@
+# app/background_tasks/runner.py
+
+import asyncio
+import os
+import threading
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from app.config import settings
+from app.database import engine
+from app.utils import start_metrics_server, logger
+
+# One event loop per worker process, running on its own daemon thread. Celery
+# pool threads (or greenlets) hand coroutines to it, so several I/O-bound jobs
+# in the same process interleave on one loop and share the engine's pool;
+# asyncpg/aiosqlite connections are bound to the loop that opened them.
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's running event loop, starting it on first use or after a fork."""
+    global _loop, _loop_pid, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="celery-asyncio-loop", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the worker's event loop and wait for its result.
+
+    Safe to call from any number of pool threads at once; each caller blocks
+    only its own thread while the loop keeps serving the other jobs.
+
+    Raises:
+        RuntimeError: If called from the loop thread itself, which would deadlock.
+    """
+    loop = get_worker_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_async() cannot be called from the worker event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def stop_worker_loop():
+    """Dispose of the engine's pooled connections and stop the loop thread."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+            return
+        loop, thread = _loop, _loop_thread
+        asyncio.run_coroutine_threadsafe(engine.dispose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        _loop, _loop_thread = None, None
+
+
+@worker_process_init.connect
+def _reset_engine_after_fork(**kwargs):
+    # Connections inherited from the parent belong to another process (and
+    # loop); drop them without closing so the parent's sockets are untouched.
+    engine.sync_engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_engine_on_shutdown(**kwargs):
+    stop_worker_loop()
+
+
+@worker_init.connect
+def _warn_if_cache_is_local(**kwargs):
+    # Jobs invalidate cached responses and counters; with a per-process cache
+    # (only accepted in development) those invalidations never reach the API
+    if settings.CACHE_BACKEND == "memory":
+        logger.warning("CACHE_BACKEND=memory: job invalidations do not reach the API, which serves stale entries until they expire")
+
+
+@worker_init.connect
+def _serve_worker_metrics(**kwargs):
+    # Job durations are recorded in the process that runs them, i.e. the main
+    # worker process for the threads/gevent pools
+    if settings.CELERY_METRICS_PORT:
+        start_metrics_server(settings.CELERY_METRICS_PORT)
+        logger.info(f"Serving worker metrics on port {settings.CELERY_METRICS_PORT}")
@@ -0,0 +1,72 @@
+# app/background_tasks/scheduler.py
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select
+from app.config import settings
+from app.database import engine
+from app.models import BackgroundTask, JobLock
+from app.utils import dialect_insert
+
+
+async def acquire_job_lock(name: str, ttl: int = None) -> uuid.UUID | None:
+    """
+    Take the cluster-wide lease for a job.
+
+    A single upsert claims the lock row when it is free or its lease has
+    expired (e.g. the holding worker died), so two workers can never both
+    succeed.
+
+    Args:
+        name (str): The job's task name.
+        ttl (int): Lease length in seconds, defaults to SCHEDULER_LOCK_TTL_SECONDS.
+
+    Returns:
+        uuid.UUID | None: The owner token to release with, or None if another
+        run holds the lock.
+    """
+    owner = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl or settings.SCHEDULER_LOCK_TTL_SECONDS)
+    async with engine.begin() as conn:
+        stmt = dialect_insert(conn, JobLock.__table__).values(
+            name=name, owner=owner, expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"owner": owner, "expires_at": expires_at},
+            where=JobLock.__table__.c.expires_at < now,
+        ).returning(JobLock.__table__.c.owner)
+        claimed = (await conn.execute(stmt)).scalar()
+    return owner if claimed == owner else None
+
+
+async def release_job_lock(name: str, owner: uuid.UUID):
+    """Release a lease, unless it has already been reclaimed by another run."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            delete(JobLock).where(JobLock.name == name, JobLock.owner == owner)
+        )
+
+
+async def last_watermark(name: str) -> datetime | None:
+    """
+    Return the watermark of a job's last successful run that recorded one.
+
+    Each tracked run that uses watermarks stores its start time under
+    `parameters["watermark"]`; rows changed after it have not been processed.
+    Runs given an explicit `since` store none and are passed over.
+    """
+    async with engine.connect() as conn:
+        parameters = await conn.scalar(
+            select(BackgroundTask.parameters)
+            .where(
+                BackgroundTask.name == name,
+                BackgroundTask.status == "completed",
+                BackgroundTask.parameters["watermark"].as_string().is_not(None),
+            )
+            .order_by(BackgroundTask.created_at.desc())
+            .limit(1)
+        )
+    watermark = (parameters or {}).get("watermark")
+    return datetime.fromisoformat(watermark) if watermark else None
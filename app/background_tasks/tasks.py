@@ -1,58 +1,34 @@
 # app/background_tasks/tasks.py
-from celery import shared_task
 from .jobs import (
+    analytics_jobs,
     assignment_jobs,
     submission_jobs,
     course_jobs,
     system_jobs,
 )
 
-# @shared_task(bind=True)
-# async def assignment_reminder_task(self):
-#     await assignment_jobs.handle_assignment_reminders()  # Added ()
+# Every job decorated with @with_task_tracking is already a Celery task that
+# runs its coroutine on the worker's event loop (see runner.py). Importing the
+# job modules here registers them through autodiscovery. The aliases below are
+# for callers enqueueing jobs from code (`.delay()`); tasks are registered, and
+# scheduled by beat (celery_config.py), under their `jobs.*` module names.
 
-# @shared_task(bind=True)
-# async def close_expired_assignment_task(self):
-#     await assignment_jobs.close_expired_assignments()  # Added ()
+assignment_reminder_task = assignment_jobs.handle_assignment_reminders
+close_expired_assignment_task = assignment_jobs.close_expired_assignments
 
+process_plagiarism_check_task = submission_jobs.check_submission_plagiarism
+process_assignment_plagiarism_task = submission_jobs.check_assignment_plagiarism
+notify_instructors_for_grading_task = submission_jobs.notify_instructors_for_grading
 
-# @shared_task(bind=True)
-# async def process_plagiarism_check_task(submission_id):
-#     await submission_jobs.check_submission_plagiarism(submission_id)
+clean_old_submissions_task = system_jobs.clean_old_submissions
+database_backup_task = system_jobs.perform_database_backup
+cleanup_tasks = system_jobs.clean_old_tasks
 
-# @shared_task(bind=True)
-# async def notify_instructors_for_grading_task(assignment_id):
-#     await submission_jobs.notify_instructors_for_grading(assignment_id)
+bulk_enroll_students_task = course_jobs.bulk_enroll_students
+archive_courses_task = course_jobs.archive_completed_courses
+manage_instructors_task = course_jobs.manage_course_instructors
+process_course_expiration_task = course_jobs.process_course_expirations
+publish_modules_task = course_jobs.publish_scheduled_modules
+reconcile_course_stats_task = course_jobs.reconcile_course_stats
 
-
-# @shared_task(bind=True)
-# async def clean_old_submissions_task(self):
-#     await system_jobs.clean_old_submissions()  # Added ()
-
-# @shared_task(bind=True)
-# async def database_backup_task(self):
-#     await system_jobs.perform_database_backup()  # Added ()
-
-# @shared_task(bind=True)
-# async def cleanup_tasks(self):
-#     await system_jobs.clean_old_tasks()  # Added ()
-
-# @shared_task(bind=True)
-# async def bulk_enroll_students_task(self, course_id, user_emails):
-#     await course_jobs.bulk_enroll_students(course_id, user_emails)
-
-# @shared_task(bind=True)
-# async def archive_courses_task(self):
-#     await course_jobs.archive_completed_courses()  # Added ()
-
-# @shared_task(bind=True)
-# async def manage_instructors_task(course_id, instructor_ids, action):
-#     await course_jobs.manage_course_instructors(course_id, instructor_ids, action)
-
-# @shared_task(bind=True)
-# async def process_course_expiration_task(self):
-#     await course_jobs.process_course_expirations()  # Added ()
-
-# @shared_task(bind=True)
-# async def publish_modules_task(self):
-#     await course_jobs.publish_scheduled_modules()  # Added ()
\ No newline at end of file
+refresh_analytics_task = analytics_jobs.refresh_student_analytics
@@ -0,0 +1,88 @@
+# app/bootstrap.py
+"""
+One-shot database bootstrap: migrate to the latest schema and seed built-in rows.
+
+Run once per deploy, before starting the API workers (which then only check
+that the schema revision matches):
+    python -m app.bootstrap
+"""
+
+import argparse
+import asyncio
+import time
+from alembic import command
+from sqlalchemy import inspect
+from app.database import engine
+from app.utils import initialize_roles_and_permissions, seed_superadmin
+from app.utils.schema import alembic_config, current_schema_revisions
+
+
+async def has_unversioned_schema() -> bool:
+    """Whether tables exist that were created without Alembic (e.g. by create_all)."""
+    async with engine.connect() as conn:
+        if await current_schema_revisions(conn) is not None:
+            return False
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("users"))
+
+
+async def bootstrap(seed: bool = True, stamp_existing: bool = False) -> dict[str, float]:
+    """
+    Migrate the database to head and seed it, timing each step.
+
+    Args:
+        seed (bool): Upsert built-in permissions, roles and the superadmin.
+        stamp_existing (bool): Mark a schema created outside Alembic as being
+            at head instead of refusing to migrate it.
+
+    Returns:
+        dict[str, float]: Seconds spent per step.
+    """
+    timings = {}
+    config = alembic_config()
+
+    start = time.perf_counter()
+    if await has_unversioned_schema():
+        if not stamp_existing:
+            raise SystemExit(
+                "The database has tables but no Alembic revision. If it matches the "
+                "current models, rerun with --stamp-existing to adopt it."
+            )
+        # Alembic's env.py runs its own event loop, so it gets a thread
+        await asyncio.to_thread(command.stamp, config, "head")
+    else:
+        await asyncio.to_thread(command.upgrade, config, "head")
+    timings["migrate"] = time.perf_counter() - start
+
+    if seed:
+        start = time.perf_counter()
+        try:
+            await initialize_roles_and_permissions()
+            await seed_superadmin()
+        except Exception as e:
+            # A non-zero exit keeps the deploy from rolling out API workers against an unseeded database
+            raise SystemExit(f"Seeding failed: {e}") from e
+        timings["seed"] = time.perf_counter() - start
+
+    await engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skip-seed", action="store_true", help="only run migrations")
+    parser.add_argument(
+        "--stamp-existing",
+        action="store_true",
+        help="adopt a schema created by create_all by stamping it at head",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = asyncio.run(bootstrap(seed=not args.skip_seed, stamp_existing=args.stamp_existing))
+    steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items())
+    print(f"Bootstrap finished in {time.perf_counter() - start:.2f}s ({steps})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,41 @@
 from celery.beat import crontab
+from app.config import settings
+
+JOBS = "app.background_tasks.jobs"
+
+# Periodic jobs and their cadence settings. Every job listed here is exclusive
+# (one active run cluster-wide) and idempotent, so overlapping ticks are safe.
+PERIODIC_JOBS = {
+    "assignment-reminders": (f"{JOBS}.assignment_jobs.handle_assignment_reminders", settings.SCHEDULE_ASSIGNMENT_REMINDERS),
+    "close-expired-assignments": (f"{JOBS}.assignment_jobs.close_expired_assignments", settings.SCHEDULE_CLOSE_EXPIRED_ASSIGNMENTS),
+    "course-expirations": (f"{JOBS}.course_jobs.process_course_expirations", settings.SCHEDULE_COURSE_EXPIRATIONS),
+    "publish-scheduled-modules": (f"{JOBS}.course_jobs.publish_scheduled_modules", settings.SCHEDULE_PUBLISH_MODULES),
+    "reconcile-payments": (f"{JOBS}.course_jobs.reconcile_payments", settings.SCHEDULE_RECONCILE_PAYMENTS),
+    "reconcile-course-stats": (f"{JOBS}.course_jobs.reconcile_course_stats", settings.SCHEDULE_RECONCILE_COURSE_STATS),
+    "refresh-analytics": (f"{JOBS}.analytics_jobs.refresh_student_analytics", settings.SCHEDULE_REFRESH_ANALYTICS),
+}
+
+
+def build_beat_schedule() -> dict:
+    """Build the Celery beat schedule, leaving out jobs whose cadence is 0."""
+    schedule = {
+        name: {"task": task, "schedule": float(seconds)}
+        for name, (task, seconds) in PERIODIC_JOBS.items()
+        if seconds > 0
+    }
+    if settings.SCHEDULE_REBUILD_ANALYTICS > 0:
+        # Same job without a watermark; shares the refresh's lock, so they never overlap
+        schedule["rebuild-analytics"] = {
+            "task": f"{JOBS}.analytics_jobs.refresh_student_analytics",
+            "schedule": float(settings.SCHEDULE_REBUILD_ANALYTICS),
+            "kwargs": {"since": None},
+        }
+    schedule["clean-submissions-weekly"] = {
+        "task": f"{JOBS}.system_jobs.clean_old_submissions",
+        "schedule": crontab(day_of_week="sunday", hour=4, minute=0),
+    }
+    return schedule
+
 
 class CeleryConfig:
     # Use RabbitMQ as the message broker
@@ -28,12 +65,7 @@ class CeleryConfig:
     worker_task_log_format = "%(asctime)s - %(task_name)s - %(levelname)s - %(message)s"
     task_serializer = "json"
     accept_content = ["json"]
-    # beat_schedule = {
-    #     'clean-submissions-weekly': {
-    #         'task': 'app.background_tasks.tasks.clean_old_submissions_task',
-    #         'schedule': crontab(day_of_week='sunday', hour=4)
-    #     },
-    # }
+    beat_schedule = build_beat_schedule()
 
 
 celery_config = CeleryConfig()
@@ -1,5 +1,7 @@
 # app/config.py
 
+from typing import Literal
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 import os
 from dotenv import load_dotenv
@@ -15,12 +17,88 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    # Database engine and connection pool settings
+    DB_ECHO: bool = ENVIRONMENT == "development"  # SQL echo is only on in development
+    DB_POOL_MODE: str = "fixed"  # "fixed" uses DB_POOL_SIZE, "per_worker" splits DB_MAX_CONNECTIONS across workers
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_MAX_CONNECTIONS: int = 100  # Total connections budget shared by all workers in "per_worker" mode
+    WEB_CONCURRENCY: int = 1  # Number of uvicorn workers (same variable uvicorn reads)
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a connection before giving up
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced, -1 disables
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statement cache, 0 for pgbouncer
+
     # JWT and authentication settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "myjwtsecretkey")  # Default secret
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost factor for new hashes
+    PASSWORD_HASH_WORKERS: int = 4  # Threads dedicated to bcrypt work
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Queued hash/verify calls before rejecting with 503
+
+    # What the API lifespan does with the schema: "check" that it is migrated to
+    # head (run `python -m app.bootstrap` per deploy), "create" tables and seed
+    # on every start, or "skip". Defaults to "create" only in development
+    SCHEMA_STARTUP: Literal["check", "create", "skip"] = "create" if ENVIRONMENT == "development" else "check"
+
+    # Audit logging
+    LOG_MODE: str = "queue"  # "queue" formats and writes on a background thread, "sync" on the caller's
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line, extra fields as keys)
+    LOG_FILE: str = "audit_logs.log"
+    LOG_QUEUE_SIZE: int = 10_000  # Records waiting for the writer thread before new ones are dropped
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0  # Fraction of successful (< 400) request records kept
+
+    # Verified-token cache used by get_current_user. Revocations reach other
+    # processes through the cache backend's versions, so only with CACHE_BACKEND=redis
+    TOKEN_CACHE_MAX_SIZE: int = 10_000  # Max cached tokens per process, 0 disables the cache
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # Upper bound on entry lifetime, never past token exp
+    ANALYTICS_VERSION_TTL_SECONDS: int = 5  # How long a process trusts its view of the last analytics run
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Record request, SQL and job metrics
+    # GET /metrics on the API port is only mounted when this is set, and scrapers
+    # must send `Authorization: Bearer <token>`
+    METRICS_TOKEN: str = ""
+    CELERY_METRICS_PORT: int = 0  # Port a Celery worker serves its metrics on, 0 disables
+
+    # Development/test query inspection: logs likely N+1 patterns per request or
+    # job and adds X-Query-Count / X-Query-Time-Ms response headers
+    QUERY_INSPECTION: bool = False
+    QUERY_INSPECTION_N_PLUS_ONE_THRESHOLD: int = 5  # Repeats of one statement shape that get flagged
+
+    # Response cache for read-heavy endpoints
+    CACHE_ENABLED: bool = True
+    # "memory" is a per-process LRU: invalidations (and token revocations) made by
+    # other API workers or Celery jobs never reach it, so it is only for a single
+    # development process. "redis" is shared by every process, and the default
+    # outside development or with several uvicorn workers
+    CACHE_BACKEND: Literal["memory", "redis"] = (
+        "memory" if ENVIRONMENT == "development" and int(os.getenv("WEB_CONCURRENCY", "1")) <= 1 else "redis"
+    )
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "aether"
+    CACHE_MAX_ENTRIES: int = 10_000  # Memory backend only
+    CACHE_DEFAULT_TTL_SECONDS: int = 60  # Also bounds staleness from writes that skip invalidation
+    CACHE_LOCK_TIMEOUT_SECONDS: float = 5.0  # How long other processes wait on a fill before computing themselves
+
     # Celery Configuration
     CELERY_BROKER_URL: str 
     CELERY_RESULT_BACKEND: str 
+    CELERY_WORKER_POOL: str = "threads"  # "threads" or "gevent" let one process run jobs concurrently on its event loop
+    CELERY_WORKER_CONCURRENCY: int = 8  # Jobs in flight per worker process
+    CELERY_PLAGIARISM_QUEUE: str = ""  # Route plagiarism jobs to this queue so only its workers load scikit-learn
+
+    # Periodic job cadences for Celery beat, in seconds (0 disables the job)
+    SCHEDULE_ASSIGNMENT_REMINDERS: int = 3600
+    SCHEDULE_CLOSE_EXPIRED_ASSIGNMENTS: int = 300
+    SCHEDULE_COURSE_EXPIRATIONS: int = 86400
+    SCHEDULE_PUBLISH_MODULES: int = 60
+    SCHEDULE_RECONCILE_PAYMENTS: int = 3600
+    SCHEDULE_RECONCILE_COURSE_STATS: int = 86400
+    SCHEDULE_REFRESH_ANALYTICS: int = 900
+    SCHEDULE_REBUILD_ANALYTICS: int = 86400  # Full rebuild, for changes the incremental refresh cannot see
+    SCHEDULER_LOCK_TTL_SECONDS: int = 900  # Lease on a running periodic job, reclaimed if its worker dies
 
     # Other security settings
     ALLOWED_HOSTS: list = ["*"]
@@ -29,5 +107,11 @@ class Settings(BaseSettings):
     class Config:
         env_file=".env"
 
+    @model_validator(mode="after")
+    def check_cache_backend(self):
+        if self.CACHE_BACKEND == "memory" and (self.WEB_CONCURRENCY > 1 or self.ENVIRONMENT != "development"):
+            raise ValueError("CACHE_BACKEND=memory only works for a single development process; use redis")
+        return self
+
 # Instantiate settings
 settings = Settings()
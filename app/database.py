@@ -1,13 +1,99 @@
 # app/database.py
 
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
+
+class PoolCheckoutStats:
+    """Running totals of how long requests waited for a pooled connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.total_wait,
+            "wait_seconds_avg": self.total_wait / self.checkouts if self.checkouts else 0.0,
+            "wait_seconds_max": self.max_wait,
+        }
+
+
+pool_checkout_stats = PoolCheckoutStats()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records the time spent waiting for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_checkout_stats.timeouts += 1
+            raise
+        pool_checkout_stats.record(time.perf_counter() - start)
+        return conn
+
+
+def get_pool_size() -> tuple[int, int]:
+    """
+    Resolve (pool_size, max_overflow) for this process.
+
+    In "per_worker" mode the DB_MAX_CONNECTIONS budget is split evenly across
+    WEB_CONCURRENCY workers, a third of each share being overflow.
+    """
+    if settings.DB_POOL_MODE == "per_worker":
+        per_worker = max(settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1), 1)
+        max_overflow = per_worker // 3
+        return per_worker - max_overflow, max_overflow
+    return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+
+def get_engine_options(url: str) -> dict:
+    """Build create_async_engine keyword arguments from settings."""
+    parsed_url = make_url(url)
+    options = {"echo": settings.DB_ECHO}
+
+    # In-memory SQLite keeps its StaticPool; pool sizing doesn't apply
+    if parsed_url.get_backend_name() == "sqlite" and parsed_url.database in (None, "", ":memory:"):
+        return options
+
+    pool_size, max_overflow = get_pool_size()
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if parsed_url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
 # Create the asynchronous database engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
 
 # Create an asynchronous session factory
 AsyncSessionLocal = sessionmaker(
@@ -18,6 +104,20 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def get_pool_status() -> dict:
+    """Current pool occupancy plus checkout wait statistics."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__, "checkout_wait": pool_checkout_stats.as_dict()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
 # Dependency to get the asynchronous database session
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -1,35 +1,80 @@
 # app/main.py
 
+import time
+
+# Taken before the imports below so time-to-ready includes loading the app
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import (
+    Depends,
     FastAPI,
     Request
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from app.database import engine, Base
 from app.config import settings
-from app.utils import logger
-from app.utils import initialize_roles_and_permissions, seed_superadmin
-from app.models import *
-from app.routers import *
+from app.utils import logger, stop_logging
+from app.utils import (
+    MetricsMiddleware,
+    metrics_registry,
+    METRICS_CONTENT_TYPE,
+    record_startup_phase,
+    require_metrics_token,
+)
+from app.utils import QueryInspectionMiddleware
+from app.utils import initialize_roles_and_permissions, seed_superadmin, check_schema_version
+from app import models  # noqa: F401  registers every mapper before the first query
+from app.routers import (
+    auth_router,
+    admin_router,
+    user_router,
+    course_router,
+    assignment_router,
+    discussion_router,
+    payment_router,
+    analytics_router,
+    notification_router,
+    background_task_router,
+)
 
 # Create the FastAPI application
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     print("Starting up the application...")
-    
-    # Create tables asynchronously
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    await initialize_roles_and_permissions()
-    await seed_superadmin()
+    startup_started = time.perf_counter()
+
+    if settings.SCHEMA_STARTUP == "check":
+        # Migrations and seeding run once per deploy via `python -m app.bootstrap`
+        revision = await check_schema_version()
+        logger.info(f"Database schema at revision {revision}")
+    elif settings.SCHEMA_STARTUP == "create":
+        # Create tables asynchronously
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        try:
+            await initialize_roles_and_permissions()
+            await seed_superadmin()
+        except Exception as e:
+            # Local development keeps serving; deploys seed via app.bootstrap, which fails loudly
+            print(f"Error seeding roles and superadmin: {e}")
+
+    ready = time.perf_counter()
+    record_startup_phase("import", startup_started - IMPORT_STARTED)
+    record_startup_phase("startup", ready - startup_started)
+    logger.info(
+        f"Ready in {ready - IMPORT_STARTED:.2f}s (imports {startup_started - IMPORT_STARTED:.2f}s, "
+        f"startup {ready - startup_started:.2f}s, schema mode '{settings.SCHEMA_STARTUP}')"
+    )
 
     try:
         yield
     finally:
         print("Shutting down the application...")
+        stop_logging()
 
 
 app = FastAPI(
@@ -70,14 +115,45 @@ async def log_requests(request: Request, call_next):
     method = request.method
     client_ip = request.client.host
 
-    logger.info(f"Request: {method} {endpoint} from {client_ip}")
-    
-    response = await call_next(request)
-    
-    logger.info(f"Response: {method} {endpoint} returned {response.status_code}")
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        logger.exception(
+            "Request: %s %s from %s failed", method, endpoint, client_ip,
+            extra={"method": method, "path": endpoint, "client": client_ip, "status_code": 500},
+        )
+        raise
+
+    # One record per request; its message is only formatted on the writer thread
+    duration_ms = (time.perf_counter() - start) * 1000
+    logger.info(
+        "Request: %s %s from %s returned %s in %.1fms",
+        method, endpoint, client_ip, response.status_code, duration_ms,
+        extra={
+            "method": method,
+            "path": endpoint,
+            "client": client_ip,
+            "status_code": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+        },
+    )
     return response
 
 
+if settings.QUERY_INSPECTION:
+    app.add_middleware(QueryInspectionMiddleware)
+
+# Added last so it is outermost and also times the middlewares above
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+    # Route templates, status mix and pool state are not for the public
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+    def metrics():
+        return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 
 # Root endpoint for health check
 @app.get("/")
@@ -3,18 +3,19 @@
 from .user import User
 from .admin import Admin, Role
 from .course import Course, CourseStatus
-from .module import Module
-from .assignment import Assignment
+from .module import Module, ModuleStatus
+from .assignment import Assignment, AssignmentStatus
 from .student import Student
 from .enrollment import Enrollment, EnrollmentStatus
 from .analytics import Analytics
 from .instructor import Instructor
 from .comment import Comment
 from .discussion import Discussion
-from .background_task import BackgroundTask, BackgroundTaskType
+from .background_task import BackgroundTask, BackgroundTaskType, JobLock
 from .lesson import Lesson
 from .notification import Notification, NotificationType
 from .payment import Payment
 from .submission import Submission
+from .plagiarism import PlagiarismFingerprint
 from .permission import Permission
 from .association_tables import course_instructors, role_permission
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, ForeignKey, DateTime, Float
+from sqlalchemy import Column, ForeignKey, DateTime, Float, Index, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,7 +15,16 @@ class Analytics(Base):
     course_id = Column(UUID(as_uuid=True), ForeignKey('courses.id'))
     student_id = Column(UUID(as_uuid=True), ForeignKey('students.id'))
     completion_rate = Column(Float)
+    average_grade = Column(Float, nullable=True)
+    assignments_submitted = Column(Integer, default=0)
     last_active = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    # One row per student per course, upserted by the aggregation job
+    __table_args__ = (
+        UniqueConstraint("course_id", "student_id", name="uq_analytics_course_id_student_id"),
+        Index("ix_analytics_student_id", "student_id"),
+    )
     
     course = relationship("Course")
     student = relationship("Student", back_populates="analytics")
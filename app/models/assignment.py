@@ -2,12 +2,16 @@
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from enum import Enum as PyEnum
 
+class AssignmentStatus(str, PyEnum):
+    OPEN="open"
+    CLOSED="closed"
 
 class Assignment(Base):
     __tablename__ = 'assignments'
@@ -17,7 +21,13 @@ class Assignment(Base):
     description = Column(Text)
     due_date = Column(DateTime)
     content = Column(String)
+    status = Column(Enum(AssignmentStatus), default=AssignmentStatus.OPEN)
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+
+    # Serves the expiry scan in close_expired_assignments
+    __table_args__ = (
+        Index("ix_assignments_status_due_date", "status", "due_date"),
+    )
     
     course = relationship("Course", back_populates="assignments")
     submissions = relationship("Submission", back_populates="assignment")
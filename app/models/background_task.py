@@ -2,7 +2,7 @@
 
 import uuid
 from app.database import Base
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Text, JSON
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -22,6 +22,7 @@ class BackgroundTask(Base):
     __tablename__ = 'background_tasks'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), comment="Celery task name of the job")
     task_type = Column(Enum(BackgroundTaskType, name='task_types'), nullable=False)
     status = Column(Enum(
         'pending', 
@@ -35,4 +36,18 @@ class BackgroundTask(Base):
     result = Column(Text, comment="Task execution result or error message")
 
     created_at = Column(DateTime(timezone=True), default=func.now())
-    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    # Serves the last-successful-run (watermark) lookup per job
+    __table_args__ = (
+        Index("ix_background_tasks_name_status_created_at", "name", "status", "created_at"),
+    )
+
+
+class JobLock(Base):
+    """Cluster-wide lease ensuring only one run of a periodic job is active."""
+    __tablename__ = 'job_locks'
+
+    name = Column(String(255), primary_key=True)
+    owner = Column(UUID(as_uuid=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
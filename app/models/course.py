@@ -1,7 +1,7 @@
 # app/models/course.py
 
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Enum, Integer, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Enum, Integer, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,11 +24,21 @@ class Course(Base):
     description = Column(Text)
     status = Column(Enum(CourseStatus), default=CourseStatus.ACTIVE)
     duration_days = Column(Integer, nullable=True)  
+    end_date = Column(DateTime(timezone=True), nullable=True)  # When the course closes, if it does
     enrollment_count = Column(Integer, default=0)
     instructor_count = Column(Integer, default=0)
     is_free = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
 
+    # Keyset pagination indexes for the catalogue listing, newest first
+    __table_args__ = (
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index("ix_courses_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_courses_is_free_created_at_id", "is_free", "created_at", "id"),
+        # Expiration and archiving jobs scan courses by status and end date
+        Index("ix_courses_status_end_date", "status", "end_date"),
+    )
+
     # Many-to-Many Relationship with Instructors (using string-based reference)
     instructors = relationship("Instructor", secondary=course_instructors, back_populates="courses")
     
@@ -68,5 +78,5 @@ class Course(Base):
                 if enrollment.status == EnrollmentStatus.ACTIVE]
 
     def get_enrollment_count(self):
-        """Return total number of enrollments."""
-        return len(self.enrollments)
+        """Return total number of enrollments (the maintained counter, no relationship load)."""
+        return self.enrollment_count or 0
@@ -1,5 +1,5 @@
 # app/models/enrollment.py
-from sqlalchemy import Column, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, ForeignKey, DateTime, Enum, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, object_session
 from sqlalchemy.sql import func
@@ -24,6 +24,18 @@ class Enrollment(Base):
     end_date = Column(DateTime, nullable=True)  # Optional, can be set when course is completed
     status = Column(Enum(EnrollmentStatus), default=EnrollmentStatus.ACTIVE)
     completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # Status changes bump it too
+
+    # A student can only be enrolled once per course; bulk enrollment relies on
+    # this for ON CONFLICT DO NOTHING
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", name="uq_enrollments_student_id_course_id"),
+        # Course rosters, seekable by student range for chunked notification fan-out
+        Index("ix_enrollments_course_id_student_id", "course_id", "student_id"),
+        # Incremental analytics refresh: enrollments created or changed since a watermark
+        Index("ix_enrollments_enrolled_at", "enrolled_at"),
+        Index("ix_enrollments_updated_at", "updated_at"),
+    )
     
     # Relationships
     student = relationship("Student", back_populates="enrollments")
@@ -35,7 +47,8 @@ class Enrollment(Base):
         if self.course and self.course.duration_days:
             self.end_date = self.start_date + timedelta(days=self.course.duration_days)
         if self.course:
-            self.course.enrollment_count += 1
+            # Flushed as `enrollment_count = enrollment_count + 1`, safe under concurrency
+            self.course.enrollment_count = type(self.course).enrollment_count + 1
 
     def complete_enrollment(self):
         """Mark enrollment as completed."""
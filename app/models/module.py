@@ -1,12 +1,17 @@
 # app/models/user.py
 
-from sqlalchemy import Column, String, Text, ForeignKey, Float, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, Float, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from app.database import Base
+from enum import Enum as PyEnum
 
+class ModuleStatus(str, PyEnum):
+    SCHEDULED="scheduled"
+    ACTIVE="active"
+    ARCHIVED="archived"
 
 class Module(Base):
     __tablename__ = 'modules'
@@ -15,7 +20,14 @@ class Module(Base):
     title = Column(String, nullable=False)
     description = Column(Text)
     order = Column(Float)
+    status = Column(Enum(ModuleStatus), default=ModuleStatus.ACTIVE)
+    publish_date = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+
+    # Serves the scheduled-publication scan
+    __table_args__ = (
+        Index("ix_modules_status_publish_date", "status", "publish_date"),
+    )
     
     course = relationship("Course", back_populates="modules")
     lessons = relationship("Lesson", back_populates="module")
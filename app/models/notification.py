@@ -1,6 +1,6 @@
 # app/models/notification.py
 
-from sqlalchemy import Column, Text, ForeignKey, DateTime, Boolean, Enum, JSON
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Boolean, Enum, JSON, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -29,6 +29,13 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
     additional_data = Column(JSON, default={})
+    dedup_key = Column(String(255), nullable=True, comment="Set by jobs so a re-run does not notify a user twice")
+
+    # Serves the per-user inbox listing and the unread badge count
+    __table_args__ = (
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+        UniqueConstraint("user_id", "dedup_key", name="uq_notifications_user_id_dedup_key"),
+    )
     
     user = relationship("User", back_populates="notifications")
 
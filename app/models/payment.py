@@ -1,6 +1,6 @@
 # app/models/payment.py
 
-from sqlalchemy import Column, ForeignKey, DateTime, Float, Enum
+from sqlalchemy import Column, ForeignKey, DateTime, Float, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,11 @@ class Payment(Base):
     amount = Column(Float)
     payment_status = Column(Enum('pending', 'completed', 'failed', name='payment_status'))
     created_at = Column(DateTime, default=func.now())
+
+    # Serves the stale pending-payment scan in reconcile_payments
+    __table_args__ = (
+        Index("ix_payments_payment_status_created_at", "payment_status", "created_at"),
+    )
     
     user = relationship("User", back_populates="payments")
     course = relationship("Course", back_populates="payments")
@@ -0,0 +1,22 @@
+# app/models/plagiarism.py
+
+from sqlalchemy import Column, ForeignKey, BigInteger, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class PlagiarismFingerprint(Base):
+    """
+    One hashed character n-gram from a submission's bottom-k sketch.
+
+    Rows form an inverted index per assignment: submissions sharing many
+    fingerprint hashes are plagiarism candidates for each other.
+    """
+    __tablename__ = 'plagiarism_fingerprints'
+    submission_id = Column(UUID(as_uuid=True), ForeignKey('submissions.id', ondelete="CASCADE"), primary_key=True)
+    hash = Column(BigInteger, primary_key=True)
+    assignment_id = Column(UUID(as_uuid=True), ForeignKey('assignments.id', ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_plagiarism_fingerprints_assignment_id_hash", "assignment_id", "hash"),
+    )
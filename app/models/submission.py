@@ -1,6 +1,6 @@
 # app/models/submission.py
 
-from sqlalchemy import Column, String,ForeignKey, DateTime, Float, JSON
+from sqlalchemy import Column, String,ForeignKey, DateTime, Float, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -15,9 +15,18 @@ class Submission(Base):
     student_id = Column(UUID(as_uuid=True), ForeignKey('students.id'))
     content = Column(String)
     submitted_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # Grading bumps it too
     grade = Column(Float, nullable=True)
     plagiarism_score= Column(Float)
     plagiarism_report= Column(JSON, default={})
+
+    # Serves "has this student submitted?" anti-joins per assignment
+    __table_args__ = (
+        Index("ix_submissions_assignment_id_student_id", "assignment_id", "student_id"),
+        # Incremental analytics refresh: submissions created or graded since a watermark
+        Index("ix_submissions_submitted_at", "submitted_at"),
+        Index("ix_submissions_updated_at", "updated_at"),
+    )
     
     assignment = relationship("Assignment", back_populates="submissions")
     student = relationship("Student", back_populates="submissions")
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from app.database import get_db
+from app.database import get_db, get_pool_status
 from app.models import Role, Admin, User
 from app.utils import (
     get_current_admin,
@@ -17,6 +17,7 @@ from app.utils import (
     get_admin_by_id,
     get_role_by_id,
     get_user_by_id,
+    invalidate_user_tokens,
 )
 from app.schemas.admin import AdminResponse, AdminCreate, AdminUpdate
 
@@ -68,6 +69,19 @@ async def get_role(
         )
 
 
+# ------------------------------ System Endpoints ------------------------------
+
+
+@router.get("/db-pool")
+async def db_pool_status(
+    current_user: User = Depends(get_superadmin),  # Superadmin can inspect the pool
+):
+    """
+    Report connection pool occupancy and checkout wait times for this worker.
+    """
+    return get_pool_status()
+
+
 # ------------------------------ Admin User Management Endpoints ------------------------------
 
 
@@ -193,6 +207,7 @@ async def update_admin(
             role = await get_role_by_id(db, admin_data.role_id)
             admin.user.role = role
         await db.commit()
+        await invalidate_user_tokens(admin.id)
         logger.info(f"Admin '{admin.id}' updated by admin '{current_user.email}'.")
         return {"message": f"Admin '{admin.user.full_name}' updated successfully"}
     except Exception as e:
@@ -228,6 +243,7 @@ async def delete_admin(
         await db.delete(admin)
         await db.delete(user)
         await db.commit()
+        await invalidate_user_tokens(admin.id)
         logger.info(f"Admin '{admin.id}' deleted by admin '{current_user.email}'.")
     except Exception as e:
         logger.error(f"Error deleting admin: {e}")
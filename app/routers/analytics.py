@@ -1,40 +1,118 @@
 # app/routers/analytics.py
 
+from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import exists, func
 from app.database import get_db
 from app.models import Analytics, User
+from app.models.association_tables import course_instructors
 from app.utils import (
     get_current_student, 
     get_current_instructor, 
+    analytics_etag,
+    etag_matches,
+    etag_headers,
+    not_modified,
     logger
     )
+from app.schemas import (
+    AnalyticsResponse,
+    CourseAnalyticsResponse
+    )
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Analytics rows are precomputed by the refresh_student_analytics job, so every
+# response is versioned by its last run. A request whose If-None-Match still
+# matches is answered with 304 before the analytics rows are read (the caller's
+# token is resolved from the token cache; course analytics first checks the
+# caller still teaches the course). The caller's id is part of the ETag, so
+# one only validates for the user it was issued to.
+
 
-@router.get("/")
+@router.get("/", response_model=List[AnalyticsResponse])
 async def get_analytics(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_student),
 ):
+    etag = await analytics_etag(request, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     analytics = await db.execute(
         select(Analytics).where(Analytics.student_id == current_user.id)
     )
+    response.headers.update(etag_headers(etag))
     return analytics.scalars().all()
 
 
-@router.get("/{student_id}")
+@router.get("/courses/{course_id}", response_model=CourseAnalyticsResponse)
+async def get_course_analytics(
+    course_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_instructor),
+):
+    # Authorize before the ETag check: a 304 must not outlive removal from the course
+    teaches = await db.scalar(
+        select(
+            exists().where(
+                course_instructors.c.course_id == course_id,
+                course_instructors.c.instructor_id == current_user.id,
+            )
+        )
+    )
+    if not teaches:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this course's analytics",
+        )
+
+    etag = await analytics_etag(request, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    summary = (
+        await db.execute(
+            select(
+                func.count().label("student_count"),
+                func.avg(Analytics.completion_rate).label("average_completion_rate"),
+                func.avg(Analytics.average_grade).label("average_grade"),
+                func.max(Analytics.last_active).label("last_active"),
+            ).where(Analytics.course_id == course_id)
+        )
+    ).one()
+    students = await db.execute(
+        select(Analytics)
+        .where(Analytics.course_id == course_id)
+        .order_by(Analytics.completion_rate.desc(), Analytics.student_id)
+    )
+    response.headers.update(etag_headers(etag))
+    return {"course_id": course_id, **summary._asdict(), "students": students.scalars().all()}
+
+
+@router.get("/{student_id}", response_model=List[AnalyticsResponse])
 async def get_student_analytics(
     student_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_instructor),
 ):
+    etag = await analytics_etag(request, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     analytics = await db.execute(
         select(Analytics).where(Analytics.student_id == student_id)
     )
+    response.headers.update(etag_headers(etag))
     return analytics.scalars().all()
 
 
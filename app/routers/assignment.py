@@ -8,6 +8,7 @@ from app.models import Assignment, Instructor, Student, Submission
 from app.utils import (
     get_current_instructor, 
     get_current_student, 
+    index_submission,
     logger
     )
 
@@ -48,6 +49,10 @@ async def submit_assignment(
             **submission_data, assignment_id=assignment_id, student_id=current_user.id
         )
         db.add(submission)
+        await db.flush()
+        # Keep the assignment's plagiarism index current so checks only
+        # compare against candidate neighbours
+        await index_submission(db, submission.id, assignment_id, submission.content)
         await db.commit()
         logger.info(
             f"Submission for assignment '{assignment_id}' created by student '{current_user.email}'."
@@ -16,7 +16,7 @@ from app.utils import (
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
-    verify_password,
+    verify_password_async,
     get_user_by_email,
     get_admin_by_id,
     create_user,
@@ -46,7 +46,7 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     user = await get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -162,6 +162,9 @@ async def signup(
             await create_instructor(db, new_user.id)
 
         return {"message": f"{user_data.role_name.title()} created successfully", "user_id": new_user.id}
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Unexpected error during signup: {e}")
         await db.rollback()
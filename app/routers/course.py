@@ -1,36 +1,81 @@
 # app/routers/course.py
 
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import delete
-from app.database import get_db
-from app.models import Course, User, Module
+from app.database import get_db, AsyncSessionLocal
+from app.models import Course, User, Module, ModuleStatus, CourseStatus
 from app.utils import (
     get_current_instructor, 
     get_course_by_title,
     get_course_by_id,
     get_instructor_by_id,
     validate_course_owner,
+    apply_keyset,
+    build_page,
+    response_cache,
+    course_tag,
+    COURSES_TAG,
     logger
     )
 from app.schemas import (
     CourseCreate, 
     CourseResponse,
+    CoursePage,
     CourseUpdate,
     ModuleResponse,
     ModuleCreate
     )
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
-@router.get("/", response_model=List[CourseResponse])
-async def get_courses(db: AsyncSession = Depends(get_db)):
-    course = await db.execute(select(Course))
-    course = course.scalars().all()
-    return course
+# Columns clients may request through `fields=`
+COURSE_LIST_FIELDS = set(CourseResponse.model_fields)
+
+
+@router.get("/", response_model=CoursePage, response_model_exclude_unset=True)
+async def get_courses(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    course_status: Optional[CourseStatus] = Query(None, alias="status"),
+    is_free: Optional[bool] = None,
+):
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - COURSE_LIST_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        # id and created_at are always selected because they form the cursor
+        selected = [name for name in CourseResponse.model_fields if name in requested | {"id", "created_at"}]
+    else:
+        requested = COURSE_LIST_FIELDS
+        selected = list(CourseResponse.model_fields)
+
+    # Cache fills may outlive this request, so they use their own session
+    async def load_page():
+        stmt = select(*(getattr(Course, name) for name in selected))
+        if course_status is not None:
+            stmt = stmt.where(Course.status == course_status)
+        if is_free is not None:
+            stmt = stmt.where(Course.is_free == is_free)
+        stmt = apply_keyset(stmt, Course.created_at, Course.id, cursor, limit)
+
+        async with AsyncSessionLocal() as db:
+            rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+        rows, next_cursor = build_page(rows, limit)
+        items = [{k: v for k, v in row.items() if k in requested} for row in rows]
+        return {"items": items, "next_cursor": next_cursor}
+
+    key = f"courses:list:{cursor}:{limit}:{','.join(sorted(requested))}:{course_status}:{is_free}"
+    return await response_cache.get_or_set(key, load_page, tags=[COURSES_TAG])
 
 
 @router.post("/", response_model=CourseResponse)
@@ -53,6 +98,7 @@ async def create_course(
         db.add(new_course)
         await db.commit()
         await db.refresh(new_course)
+        await response_cache.invalidate(COURSES_TAG)
         logger.info(
             f"Course '{new_course.title}' created by instructor '{current_user.email}'."
         )
@@ -67,15 +113,21 @@ async def create_course(
         )
 
 @router.get("/{course_id}", response_model=CourseResponse)
-async def get_course(course_id: UUID, db: AsyncSession = Depends(get_db)):
-    course = await db.execute(select(Course).where(Course.id == course_id))
-    course = course.scalar_one_or_none()
-    if not course:
-        logger.warning(f"Course with ID '{course_id}' not found.")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
-        )
-    return course
+async def get_course(course_id: UUID):
+    async def load_course():
+        async with AsyncSessionLocal() as db:
+            course = await db.execute(select(Course).where(Course.id == course_id))
+            course = course.scalar_one_or_none()
+            if not course:
+                logger.warning(f"Course with ID '{course_id}' not found.")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+                )
+            return CourseResponse.model_validate(course)
+
+    return await response_cache.get_or_set(
+        f"courses:detail:{course_id}", load_course, tags=[course_tag(course_id)]
+    )
 
 
 @router.put("/{course_id}", response_model=CourseResponse)
@@ -88,7 +140,7 @@ async def update_course(
     try:
         
         # Get existing course
-        course = await validate_course_owner(course_id, current_user)
+        course = await validate_course_owner(db, course_id, current_user)
 
         update_data = course_data.model_dump(exclude_unset=True)
 
@@ -116,6 +168,7 @@ async def update_course(
 
         await db.commit()
         await db.refresh(course)
+        await response_cache.invalidate(COURSES_TAG, course_tag(course_id))
         
         logger.info(f"Course '{course.id}' updated by instructor '{current_user.email}'.")
         return course
@@ -141,6 +194,7 @@ async def delete_course(
             .where(Course.id == course_id)
         )
         await db.commit()
+        await response_cache.invalidate(COURSES_TAG, course_tag(course_id))
 
     except HTTPException:
         # Let specific HTTP exceptions bubble up
@@ -162,12 +216,16 @@ async def create_module(
     current_user: User = Depends(get_current_instructor),
 ):
     try:
-        course = await validate_course_owner(course_id, current_user)
+        course = await validate_course_owner(db, course_id, current_user)
         
         new_module = Module(**module_data.model_dump(), course_id=course.id)
+        publish_date = module_data.publish_date
+        if publish_date and publish_date.replace(tzinfo=publish_date.tzinfo or timezone.utc) > datetime.now(timezone.utc):
+            new_module.status = ModuleStatus.SCHEDULED
         db.add(new_module)
         await db.commit()
         await db.refresh(new_module)
+        await response_cache.invalidate(course_tag(course_id))
         logger.info(
             f"Course '{new_module.title}' created by instructor '{current_user.email}'."
         )
@@ -1,27 +1,79 @@
 # app/routers/notification.py
 
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, update
+from typing import Optional
 from app.database import get_db
 from app.models import Notification, User
 from app.utils import (
     get_current_user, 
+    apply_keyset,
+    build_page,
     logger
     )
+from app.schemas import (
+    NotificationPage,
+    UnreadCountResponse,
+    NotificationBulkRead
+    )
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
-@router.get("/")
+@router.get("/", response_model=NotificationPage)
 async def list_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    stmt = select(Notification).where(Notification.user_id == current_user.id)
+    if unread_only:
+        stmt = stmt.where(Notification.is_read.is_(False))
+    stmt = apply_keyset(stmt, Notification.created_at, Notification.id, cursor, limit)
+
+    notifications = await db.execute(stmt)
+    items, next_cursor = build_page(notifications.scalars().all(), limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
     db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
-    notifications = await db.execute(
-        select(Notification).where(Notification.user_id == current_user.id)
+    # Answered from the (user_id, is_read, created_at) index alone
+    unread_count = await db.scalar(
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == current_user.id, Notification.is_read.is_(False))
+    )
+    return {"unread_count": unread_count}
+
+
+@router.put("/read")
+async def mark_notifications_as_read(
+    data: NotificationBulkRead,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    stmt = (
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if data.notification_ids is not None:
+        stmt = stmt.where(Notification.id.in_(data.notification_ids))
+    result = await db.execute(stmt)
+    await db.commit()
+    logger.info(
+        f"{result.rowcount} notifications marked as read by user '{current_user.email}'."
     )
-    return notifications.scalars().all()
+    return {"message": "Notifications marked as read", "updated": result.rowcount}
 
 
 @router.put("/{notification_id}")
@@ -14,7 +14,8 @@ from app.utils import (
     get_role_by_id, 
     get_user_by_id, 
     get_role_by_name,
-    get_superadmin
+    get_superadmin,
+    invalidate_user_tokens
     )
 from app.schemas.auth import UserCreate
 
@@ -78,6 +79,7 @@ async def update_user(
     for key, value in user_data.items():
         setattr(user, key, value)
     await db.commit()
+    await invalidate_user_tokens(user.id)
     return {"message": "User updated successfully"}
 
 
@@ -91,6 +93,7 @@ async def update_my_profile(
     for key, value in user_data.items():
         setattr(current_user, key, value)
     await db.commit()
+    await invalidate_user_tokens(current_user.id)
     return {"message": "Profile updated successfully"}
 
 
@@ -106,6 +109,7 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
         )
     await db.delete(user)
     await db.commit()
+    await invalidate_user_tokens(user_id)
     return {"message": "User deleted successfully"}
 
 
@@ -116,6 +120,7 @@ async def delete_my_account(
 ):
     await db.delete(current_user)
     await db.commit()
+    await invalidate_user_tokens(current_user.id)
     return {"message": "Account deleted successfully"}
 
 
@@ -128,9 +133,13 @@ async def update_user_role(
     current_user: User = Depends(get_current_admin),
 ):
     role = await get_role_by_id(db,role_id)
+    # current_user.role is loaded with the user; walking admin_info would lazy-load
     if role.name == "superadmin":
-        if current_user.admin_info.user.role.value != "superadmin":
-            return
+        if current_user.role is None or current_user.role.name != "superadmin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only superadmins can grant the superadmin role",
+            )
     
     user = await get_user_by_id(db, user_id)
     if not user:
@@ -140,6 +149,7 @@ async def update_user_role(
         )
     user.role = role
     await db.commit()
+    await invalidate_user_tokens(user_id)
     return {"message": "User role updated successfully"}
 
 
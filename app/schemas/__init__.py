@@ -18,7 +18,21 @@ from .auth import(
 from .course import(
     CourseCreate,
     CourseResponse,
+    CourseListItem,
+    CoursePage,
     CourseUpdate,
     ModuleCreate,
     ModuleResponse
-)
\ No newline at end of file
+)
+
+from .notification import(
+    NotificationResponse,
+    NotificationPage,
+    UnreadCountResponse,
+    NotificationBulkRead
+)
+
+from .analytics import(
+    AnalyticsResponse,
+    CourseAnalyticsResponse
+)
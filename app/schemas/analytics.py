@@ -0,0 +1,26 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from uuid import UUID
+
+
+class AnalyticsResponse(BaseModel):
+    course_id: UUID
+    student_id: UUID
+    completion_rate: float | None
+    average_grade: float | None
+    assignments_submitted: int | None
+    last_active: datetime | None
+    updated_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
+class CourseAnalyticsResponse(BaseModel):
+    course_id: UUID
+    student_count: int
+    average_completion_rate: Optional[float] = None
+    average_grade: Optional[float] = None
+    last_active: Optional[datetime] = None
+    students: List[AnalyticsResponse]
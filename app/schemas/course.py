@@ -9,6 +9,7 @@ class CourseCreate(BaseModel):
     description: str
     is_free: bool = True
     duration_days: Optional[int] = None
+    end_date: Optional[datetime] = None
 
 class CourseResponse(BaseModel):
     id: UUID
@@ -16,6 +17,7 @@ class CourseResponse(BaseModel):
     description: str | None
     status: CourseStatus
     duration_days: int | None
+    end_date: datetime | None = None
     enrollment_count: int
     instructor_count: int
     is_free: bool
@@ -25,17 +27,38 @@ class CourseResponse(BaseModel):
         from_attributes = True  # Enable ORM mode
 
 
+class CourseListItem(BaseModel):
+    """Course row in a catalogue page; only the projected fields are set."""
+    id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[CourseStatus] = None
+    duration_days: Optional[int] = None
+    end_date: Optional[datetime] = None
+    enrollment_count: Optional[int] = None
+    instructor_count: Optional[int] = None
+    is_free: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class CoursePage(BaseModel):
+    items: List[CourseListItem]
+    next_cursor: Optional[str] = None
+
+
 class CourseUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     is_free: Optional[bool] = None
     duration_days: Optional[int] = None
+    end_date: Optional[datetime] = None
 
 
 class ModuleCreate(BaseModel):
     title: str
     description: str
     order: float
+    publish_date: Optional[datetime] = None  # Future dates schedule the module
 
 
 class ModuleResponse(BaseModel):
@@ -44,6 +67,8 @@ class ModuleResponse(BaseModel):
     title: str
     description: str
     order: float
+    status: Optional[str] = None
+    publish_date: Optional[datetime] = None
     created_at: datetime
 
     class Config:
@@ -0,0 +1,31 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+from uuid import UUID
+from app.models import NotificationType
+
+
+class NotificationResponse(BaseModel):
+    id: UUID
+    message: str | None
+    notification_type: NotificationType
+    is_read: bool
+    created_at: datetime
+    additional_data: dict | None
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+
+class NotificationBulkRead(BaseModel):
+    # Mark only these notifications; omit to mark every unread notification
+    notification_ids: Optional[List[UUID]] = None
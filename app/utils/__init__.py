@@ -4,13 +4,65 @@ from .security import (
     create_access_token, 
     verify_password, 
     hash_password,
+    verify_password_async,
+    hash_password_async,
     create_refresh_token,
     verify_refresh_token,
     verify_access_token,
     REFRESH_TOKEN_EXPIRE_DAYS
 )  # Security functions
-from .logging_config import logger
+from .logging_config import logger, log_queue_stats, stop_logging
 from .helpers import *
+from .token_cache import token_cache, invalidate_user_tokens
+from .plagiarism_index import (
+    preprocess_content,
+    fingerprint,
+    index_submission,
+    find_candidates,
+    MAX_CANDIDATES
+)
+from .notifications import (
+    enrolled_students,
+    assigned_instructors,
+    make_dedup_key,
+    fan_out_notifications
+)
+from .course_stats import (
+    adjust_course_counts,
+    add_course_instructors,
+    remove_course_instructors,
+    remove_enrollments,
+    reconcile_course_counts
+)
+from .metrics import (
+    MetricsMiddleware,
+    record_job_duration,
+    record_startup_phase,
+    start_metrics_server,
+    require_metrics_token,
+    registry as metrics_registry,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE
+)
+from .query_inspector import (
+    QueryInspectionMiddleware,
+    QueryBudgetExceeded,
+    inspect_queries,
+    query_budget,
+    assert_query_budget
+)
+from .cache import (
+    response_cache,
+    course_tag,
+    invalidate_after_commit,
+    COURSES_TAG
+)
+from .analytics_cache import (
+    analytics_version,
+    analytics_etag,
+    etag_matches,
+    etag_headers,
+    not_modified
+)
 from .dependencies import (
     get_current_admin,
     get_current_instructor,
@@ -24,4 +76,8 @@ from .dependencies import (
 from .seed import (
     initialize_roles_and_permissions,
     seed_superadmin
+)
+from .schema import (
+    check_schema_version,
+    SchemaVersionMismatch
 )
\ No newline at end of file
@@ -0,0 +1,85 @@
+# app/utils/analytics_cache.py
+
+import hashlib
+import time
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from app.config import settings
+from app.database import engine
+from app.models import BackgroundTask
+
+# Task name the aggregation job's runs are recorded under
+ANALYTICS_JOB_NAME = "app.background_tasks.jobs.analytics_jobs.refresh_student_analytics"
+
+
+class AnalyticsVersion:
+    """
+    Identifier of the last completed analytics aggregation run.
+
+    Analytics rows only change when that job runs, so the id of its latest
+    completed BackgroundTask versions every analytics response. It is looked
+    up at most once per `ttl_seconds` per process, which lets conditional
+    requests be answered without touching the database.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._value: str | None = None
+        self._expires_at = 0.0
+
+    async def get(self) -> str:
+        if self._value is None or self._expires_at <= time.monotonic():
+            async with engine.connect() as conn:
+                task_id = await conn.scalar(
+                    select(BackgroundTask.id)
+                    .where(
+                        BackgroundTask.name == ANALYTICS_JOB_NAME,
+                        BackgroundTask.status == "completed",
+                    )
+                    .order_by(BackgroundTask.created_at.desc())
+                    .limit(1)
+                )
+            self._value = str(task_id) if task_id else "none"
+            self._expires_at = time.monotonic() + self.ttl_seconds
+        return self._value
+
+    def clear(self) -> None:
+        self._value = None
+
+
+analytics_version = AnalyticsVersion(ttl_seconds=settings.ANALYTICS_VERSION_TTL_SECONDS)
+
+
+async def analytics_etag(request: Request, *scope) -> str:
+    """
+    Build the ETag of an analytics response.
+
+    Args:
+        request (Request): The incoming request; its path and query are hashed in.
+        *scope: Extra values the response depends on, e.g. the caller's id, so
+            an ETag issued to one user is never honoured for another.
+
+    Returns:
+        str: A quoted strong ETag.
+    """
+    version = await analytics_version.get()
+    parts = [version, request.url.path, request.url.query, *map(str, scope)]
+    return '"' + hashlib.sha1("|".join(parts).encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
+
+def etag_headers(etag: str) -> dict:
+    # Clients may keep the body but must revalidate before reusing it
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
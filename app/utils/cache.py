@@ -0,0 +1,310 @@
+# app/utils/cache.py
+
+import asyncio
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+
+# Entries are stored under a key that embeds the current version of each of
+# their tags. Invalidating a tag bumps its version, so every entry computed
+# under the old version becomes unreachable at once and simply ages out. A
+# value computed while an invalidation is in flight is written under the old
+# version and can never be served afterwards.
+
+
+class CacheBackend(ABC):
+    """Storage used by ResponseCache; values are bytes, versions are ints."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: int) -> bool:
+        """Set `key` only if it does not exist; return whether it was set."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def get_versions(self, tags: list[str]) -> list[int]: ...
+
+    @abstractmethod
+    async def bump_versions(self, tags: list[str]) -> None: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Bounded, TTL-based LRU cache local to the process.
+
+    Invalidations made by other processes (API workers, Celery jobs) never
+    reach it, so settings only accept it for a single development process.
+
+    Tag versions live in their own LRU of the same size. Every version handed
+    out comes from one process-wide clock, so a tag evicted and seen again
+    gets a version it never had, and entries stored under its old versions
+    stay unreachable.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._clock = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: int) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def _set_version(self, tag: str) -> int:
+        self._clock += 1
+        self._versions[tag] = self._clock
+        self._versions.move_to_end(tag)
+        while len(self._versions) > max(self.max_size, 1):
+            self._versions.popitem(last=False)
+        return self._clock
+
+    async def get_versions(self, tags: list[str]) -> list[int]:
+        versions = []
+        for tag in tags:
+            version = self._versions.get(tag)
+            if version is None:
+                version = self._set_version(tag)
+            else:
+                self._versions.move_to_end(tag)
+            versions.append(version)
+        return versions
+
+    async def bump_versions(self, tags: list[str]) -> None:
+        for tag in tags:
+            self._set_version(tag)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._versions.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every process through a Redis-compatible server."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def add(self, key: str, value: bytes, ttl: int) -> bool:
+        return bool(await self._client.set(key, value, ex=ttl, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def get_versions(self, tags: list[str]) -> list[int]:
+        if not tags:
+            return []
+        return [int(v or 0) for v in await self._client.mget(tags)]
+
+    async def bump_versions(self, tags: list[str]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(tag)
+            await pipe.execute()
+
+
+class ResponseCache:
+    """
+    Tag-invalidated cache of JSON-serialisable results with single-flight fills.
+
+    Concurrent misses on a key within a process share one computation. Across
+    processes the first to miss takes a short fill lock in the backend and
+    the others poll for its result, so a cold key is computed once.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str, default_ttl: int, lock_timeout: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def _entry_key(self, key: str, tags: list[str]) -> str:
+        versions = await self.backend.get_versions([self._tag_key(tag) for tag in tags])
+        raw = "|".join([key, *(f"{tag}={version}" for tag, version in zip(tags, versions))])
+        return f"{self.prefix}:entry:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+        ttl: int = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+
+        The fill runs as its own task and may outlive the caller that started
+        it (its client disconnecting does not cancel it for the other
+        waiters), so `compute` must not use request-scoped resources such as
+        the request's database session; open one with AsyncSessionLocal.
+
+        Args:
+            key (str): Identifies the value, e.g. route plus query parameters.
+            compute (Callable): Coroutine function producing the value; it is
+                stored in its JSON form, as returned by jsonable_encoder.
+            tags (Iterable[str]): Tags that invalidate the entry.
+            ttl (int): Lifetime in seconds, defaults to CACHE_DEFAULT_TTL_SECONDS.
+
+        Returns:
+            Any: The JSON form of the value.
+        """
+        if not settings.CACHE_ENABLED:
+            return jsonable_encoder(await compute())
+
+        entry_key = await self._entry_key(key, sorted(set(tags)))
+        cached = await self.backend.get(entry_key)
+        if cached is not None:
+            return json.loads(cached)
+
+        flight = self._inflight.get(entry_key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fill(entry_key, compute, ttl or self.default_ttl))
+            self._inflight[entry_key] = flight
+            flight.add_done_callback(lambda _: self._inflight.pop(entry_key, None))
+        # A waiter giving up must not cancel the fill the others are awaiting
+        return await asyncio.shield(flight)
+
+    async def _fill(self, entry_key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        lock_key = f"{entry_key}:lock"
+        if not await self.backend.add(lock_key, b"1", max(int(self.lock_timeout), 1)):
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                cached = await self.backend.get(entry_key)
+                if cached is not None:
+                    return json.loads(cached)
+            # The filling process is slow or gone; compute it ourselves
+        try:
+            value = jsonable_encoder(await compute())
+            await self.backend.set(entry_key, json.dumps(value).encode(), ttl)
+            return value
+        finally:
+            await self.backend.delete(lock_key)
+
+    async def tag_versions(self, *tags: str) -> list[int]:
+        """Current version of each tag; it changes whenever the tag is invalidated."""
+        return await self.backend.get_versions([self._tag_key(tag) for tag in tags])
+
+    async def invalidate(self, *tags: str) -> None:
+        """Make every entry carrying any of `tags` unreachable."""
+        if tags:
+            await self.backend.bump_versions([self._tag_key(tag) for tag in set(tags)])
+
+
+# Session.info key collecting tags to invalidate once the transaction commits
+PENDING_INVALIDATIONS_KEY = "response_cache_invalidations"
+
+# Invalidation tasks started from commit hooks, kept referenced until done
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+def invalidate_after_commit(db: AsyncSession, *tags: str) -> None:
+    """
+    Invalidate `tags` once `db`'s current transaction commits.
+
+    For helpers that change cached data without committing themselves;
+    invalidating before the commit would let a concurrent reader cache the
+    old rows again. Nothing happens if the transaction rolls back.
+    """
+    db.sync_session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    tags = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if not tags:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # Committed outside an event loop; entries expire with their TTL
+    task = loop.create_task(response_cache.invalidate(*tags))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session):
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+
+def create_cache_backend() -> CacheBackend:
+    """Build the backend selected by CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND!r}")
+
+
+response_cache = ResponseCache(
+    create_cache_backend(),
+    prefix=settings.CACHE_KEY_PREFIX,
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+    lock_timeout=settings.CACHE_LOCK_TIMEOUT_SECONDS,
+)
+
+
+def course_tag(course_id) -> str:
+    return f"course:{course_id}"
+
+
+def user_tag(user_id) -> str:
+    return f"user:{user_id}"
+
+
+# Tag for every page of the course catalogue
+COURSES_TAG = "courses"
@@ -0,0 +1,147 @@
+# app/utils/course_stats.py
+
+from collections import Counter
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Course, Enrollment
+from app.models.association_tables import course_instructors
+from .helpers.bulk import dialect_insert
+from .cache import course_tag, invalidate_after_commit
+
+# Course.enrollment_count and Course.instructor_count are maintained by the
+# helpers below as `x = x + :delta` in the transaction that changes the rows,
+# so concurrent writers never lose updates. reconcile_course_counts repairs
+# drift from writes that bypass them. None of these helpers commit; the
+# changed courses' cached responses are invalidated once the caller does.
+
+
+async def adjust_course_counts(
+    db: AsyncSession, course_id: UUID, enrollments: int = 0, instructors: int = 0
+):
+    """
+    Apply deltas to a course's counters atomically.
+
+    Args:
+        db (AsyncSession): The database session.
+        course_id (UUID): The course to update.
+        enrollments (int): Change in enrollment count.
+        instructors (int): Change in instructor count.
+    """
+    values = {}
+    if enrollments:
+        values["enrollment_count"] = func.coalesce(Course.enrollment_count, 0) + enrollments
+    if instructors:
+        values["instructor_count"] = func.coalesce(Course.instructor_count, 0) + instructors
+    if values:
+        await db.execute(
+            update(Course)
+            .where(Course.id == course_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_after_commit(db, course_tag(course_id))
+
+
+async def remove_enrollments(db: AsyncSession, *criteria) -> int:
+    """
+    Delete the enrollments matching `criteria` and decrement their courses.
+
+    Returns:
+        int: Number of enrollments removed.
+    """
+    removed = (
+        await db.execute(delete(Enrollment).where(*criteria).returning(Enrollment.course_id))
+    ).scalars().all()
+    for course_id, count in Counter(removed).items():
+        await adjust_course_counts(db, course_id, enrollments=-count)
+    return len(removed)
+
+
+async def add_course_instructors(
+    db: AsyncSession, course_id: UUID, instructor_ids: list[UUID]
+) -> list[UUID]:
+    """
+    Assign instructors to a course, skipping existing assignments.
+
+    Returns:
+        list[UUID]: The instructors that were newly assigned.
+    """
+    if not instructor_ids:
+        return []
+    added = (
+        await db.execute(
+            dialect_insert(db, course_instructors)
+            .values([{"course_id": course_id, "instructor_id": i} for i in instructor_ids])
+            .on_conflict_do_nothing()
+            .returning(course_instructors.c.instructor_id)
+        )
+    ).scalars().all()
+    await adjust_course_counts(db, course_id, instructors=len(added))
+    return added
+
+
+async def remove_course_instructors(
+    db: AsyncSession, course_id: UUID, instructor_ids: list[UUID]
+) -> list[UUID]:
+    """
+    Unassign instructors from a course.
+
+    Returns:
+        list[UUID]: The instructors that were actually removed.
+    """
+    if not instructor_ids:
+        return []
+    removed = (
+        await db.execute(
+            delete(course_instructors)
+            .where(
+                course_instructors.c.course_id == course_id,
+                course_instructors.c.instructor_id.in_(instructor_ids),
+            )
+            .returning(course_instructors.c.instructor_id)
+        )
+    ).scalars().all()
+    await adjust_course_counts(db, course_id, instructors=-len(removed))
+    return removed
+
+
+async def reconcile_course_counts(db: AsyncSession, course_id: UUID = None) -> int:
+    """
+    Recount enrollments and instructors and fix courses whose counters drifted.
+
+    Args:
+        db (AsyncSession): The database session.
+        course_id (UUID): Limit the repair to one course; all courses if None.
+
+    Returns:
+        int: Number of courses corrected.
+    """
+    enrolled = (
+        select(func.count())
+        .select_from(Enrollment)
+        .where(Enrollment.course_id == Course.id)
+        .scalar_subquery()
+    )
+    assigned = (
+        select(func.count())
+        .select_from(course_instructors)
+        .where(course_instructors.c.course_id == Course.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Course)
+        .where(
+            Course.enrollment_count.is_distinct_from(enrolled)
+            | Course.instructor_count.is_distinct_from(assigned)
+        )
+        .values(enrollment_count=enrolled, instructor_count=assigned)
+        .returning(Course.id)
+        .execution_options(synchronize_session=False)
+    )
+    if course_id is not None:
+        stmt = stmt.where(Course.id == course_id)
+    repaired = (await db.execute(stmt)).scalars().all()
+    if repaired:
+        invalidate_after_commit(db, *(course_tag(repaired_id) for repaired_id in repaired))
+    return len(repaired)
@@ -10,6 +10,7 @@ from app.database import get_db
 from app.models import User, Admin
 from pydantic import BaseModel
 from app.utils import verify_access_token, get_user_by_email, logger
+from app.utils.token_cache import token_cache, attach_cached_user, get_verified_token, user_token_version
 
 # app/utils/dependencies/auth.py
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
@@ -41,6 +42,19 @@ async def get_current_user(
         headers={"WWW-Authenticate": authenticate_value},
     )
 
+    # Fast path: token already verified and user resolved by a previous request
+    cached = await get_verified_token(token)
+    if cached is not None:
+        token_scopes = cached.payload.get("scopes", [])
+        for scope in security_scopes.scopes:
+            if scope not in token_scopes:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Insufficient permissions",
+                    headers={"WWW-Authenticate": authenticate_value},
+                )
+        return await attach_cached_user(db, cached)
+
     try:
         payload = verify_access_token(token)
         if payload is None:
@@ -67,6 +81,8 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    token_cache.set(token, payload, user, await user_token_version(user.id))
+
     # Verify scopes
     for scope in security_scopes.scopes:
         if scope not in token_data.scopes:
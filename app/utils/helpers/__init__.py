@@ -17,3 +17,18 @@ from .course import(
     get_instructor_by_id,
     validate_course_owner
 )
+
+
+from .pagination import (
+    encode_cursor,
+    decode_cursor,
+    apply_keyset,
+    build_page
+)
+
+from .bulk import (
+    BULK_CHUNK_SIZE,
+    chunked,
+    dialect_insert,
+    sql_uuid
+)
@@ -5,7 +5,7 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.models import User, Student, Instructor, Admin, Role
 from app.schemas.auth import UserCreate
-from app.utils import hash_password
+from app.utils import hash_password_async
 from uuid import UUID
 from app.utils import logger
 
@@ -109,7 +109,7 @@ async def create_user(
         role = await get_role_by_name(db=db,name=role_name)
         if not role:
             raise Exception("Role does not exist")
-        hashed_password = hash_password(user.password)
+        hashed_password = await hash_password_async(user.password)
         db_user = User(
             full_name=user.full_name,
             email=user.email,
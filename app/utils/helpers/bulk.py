@@ -0,0 +1,67 @@
+# app/utils/helpers/bulk.py
+
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+from sqlalchemy import Table, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+T = TypeVar("T")
+
+# Rows per multi-VALUES statement; keeps bind params well under asyncpg's 32767 limit
+BULK_CHUNK_SIZE = 1000
+
+
+def chunked(items: Iterable[T], size: int = BULK_CHUNK_SIZE) -> Iterator[list[T]]:
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        items (Iterable[T]): The items to split.
+        size (int): Maximum chunk length.
+
+    Yields:
+        list[T]: Consecutive chunks.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def dialect_insert(db: AsyncSession | AsyncConnection, table: Table):
+    """
+    Return an INSERT construct for the session's dialect.
+
+    Both the PostgreSQL and SQLite constructs support `on_conflict_do_nothing`
+    and `on_conflict_do_update`, which the generic `insert()` does not.
+
+    Args:
+        db (AsyncSession | AsyncConnection): The session or connection.
+        table (Table): Target table (or mapped class `__table__`).
+
+    Returns:
+        Insert: A dialect-specific insert statement.
+    """
+    dialect = db.bind.dialect if isinstance(db, AsyncSession) else db.dialect
+    if dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def sql_uuid(db: AsyncSession):
+    """
+    Return a SQL expression that generates a new UUID for each row.
+
+    Python-side column defaults such as `default=uuid.uuid4` are not applied
+    to `INSERT ... SELECT`, so set-based inserts generate keys in the database.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        ColumnElement: A UUID-producing expression for the session's dialect.
+    """
+    if db.bind.dialect.name == "sqlite":
+        # SQLite stores UUID columns as 32 hex characters
+        return func.lower(func.hex(func.randomblob(16)))
+    return func.gen_random_uuid()
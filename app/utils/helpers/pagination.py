@@ -0,0 +1,105 @@
+# app/utils/helpers/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, literal, tuple_
+from sqlalchemy.types import TypeDecorator
+
+
+class CursorTimestamp(TypeDecorator):
+    """
+    Bind type for cursor timestamps.
+
+    SQLite stores `func.now()` defaults as 'YYYY-MM-DD HH:MM:SS' text while
+    SQLAlchemy binds datetimes with a '.ffffff' suffix, which breaks text
+    comparison against the cursor row. Binding `str(value)` matches both the
+    second-precision and the microsecond storage formats.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return str(value.replace(tzinfo=None))
+        return value
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Encode a keyset position as an opaque URL-safe cursor.
+
+    Args:
+        created_at (datetime): Timestamp of the last row on the page.
+        id (UUID): Primary key of the last row on the page.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor from a previous page.
+
+    Returns:
+        tuple[datetime, UUID]: The (created_at, id) keyset position.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def apply_keyset(stmt, created_at_column, id_column, cursor: str | None, limit: int):
+    """
+    Order a select newest first on (created_at, id) and seek past the cursor.
+
+    One extra row is fetched so callers can tell whether a next page exists.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(created_at_column, id_column)
+            < tuple_(literal(created_at, CursorTimestamp()), literal(id, id_column.type))
+        )
+    return stmt.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def build_page(rows: list, limit: int) -> tuple[list, str | None]:
+    """
+    Trim the look-ahead row and compute the next cursor.
+
+    Args:
+        rows (list): Rows (mappings or objects) exposing `created_at` and `id`.
+        limit (int): The requested page size.
+
+    Returns:
+        tuple[list, str | None]: The page rows and the cursor for the next page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        return rows, encode_cursor(last["created_at"], last["id"])
+    return rows, encode_cursor(last.created_at, last.id)
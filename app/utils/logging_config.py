@@ -1,13 +1,89 @@
 # app/utils/logging_config.py
 
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from app.config import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra=` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in RESERVED_ATTRS)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SuccessSampler(logging.Filter):
+    """
+    Keep only a fraction of records for successful requests.
+
+    Records carrying a `status_code` below 400 pass with probability `rate`;
+    errors and records without a status code always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        status_code = getattr(record, "status_code", None)
+        if status_code is None or status_code >= 400 or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are handed to the listener thread unformatted; when the bounded
+    queue is full they are dropped and counted instead.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
 
 # Configure logger
-log_formatter = logging.Formatter('[%(asctime)s] - %(levelname)s - %(message)s')
+log_formatter = (
+    JsonFormatter()
+    if settings.LOG_FORMAT == "json"
+    else logging.Formatter('[%(asctime)s] - %(levelname)s - %(message)s')
+)
 
 # File handler for writing logs to a file
-log_file = "audit_logs.log"
+log_file = settings.LOG_FILE
 file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5)
 file_handler.setFormatter(log_formatter)
 file_handler.setLevel(logging.INFO)
@@ -20,5 +96,64 @@ stream_handler.setLevel(logging.DEBUG)
 # Create and configure the logger
 logger = logging.getLogger("audit_logger")
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)  # Write to file
-logger.addHandler(stream_handler)  # Write to stdout
+logger.addFilter(SuccessSampler(settings.LOG_REQUEST_SAMPLE_RATE))
+
+queue_handler = None
+queue_listener = None
+
+
+def _start_queue_logging() -> None:
+    """Route the logger through a fresh bounded queue drained by its own listener thread."""
+    global queue_handler, queue_listener
+    if queue_handler is not None:
+        logger.removeHandler(queue_handler)
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    queue_listener = QueueListener(
+        queue_handler.queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    queue_listener.start()
+    logger.addHandler(queue_handler)
+
+
+def _restart_queue_logging_in_child() -> None:
+    # A forked child (Celery prefork, gunicorn --preload) inherits the queue but
+    # not the listener thread, so nothing would ever drain it
+    if queue_listener is not None:
+        _start_queue_logging()
+
+
+if settings.LOG_MODE == "queue":
+    # The event loop only enqueues; a background thread formats and writes
+    _start_queue_logging()
+    os.register_at_fork(after_in_child=_restart_queue_logging_in_child)
+else:
+    logger.addHandler(file_handler)  # Write to file
+    logger.addHandler(stream_handler)  # Write to stdout
+
+
+def log_queue_stats() -> dict:
+    """Backlog and drop counts of the logging queue (empty in sync mode)."""
+    if queue_handler is None:
+        return {}
+    return {
+        "queued": queue_handler.queue.qsize(),
+        "capacity": queue_handler.queue.maxsize,
+        "dropped": queue_handler.dropped,
+    }
+
+
+def stop_logging() -> None:
+    """Flush queued records, stop the listener thread and log synchronously from then on."""
+    global queue_listener
+    if queue_listener is None:
+        return
+    queue_listener.stop()
+    queue_listener = None
+    logger.removeHandler(queue_handler)
+    logger.addHandler(file_handler)
+    logger.addHandler(stream_handler)
+    if queue_handler.dropped:
+        logger.warning(f"Dropped {queue_handler.dropped} log records on a full logging queue")
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,335 @@
+# app/utils/metrics.py
+
+import bisect
+import contextvars
+import hmac
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable
+from fastapi import Header, HTTPException, status
+from sqlalchemy import event
+from app.config import settings
+from app.database import engine, get_pool_status
+from .logging_config import log_queue_stats
+
+# Metrics are kept in process memory and rendered in the Prometheus text
+# format on scrape. Recording is a dict lookup and a few additions under an
+# uncontended lock; all formatting cost is paid by the scraper.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in items]
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, *labelvalues):
+        self.inc(-amount, *labelvalues)
+
+    def set(self, value: float, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._series.items()]
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of this process plus collectors sampled at scrape time."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list[str]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(
+    Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+)
+HTTP_LATENCY = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+)
+HTTP_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "HTTP requests being served."))
+HTTP_RESPONSE_BYTES = registry.register(
+    Counter("http_response_size_bytes_total", "Response body bytes sent by route template.", ("method", "route"))
+)
+DB_QUERY_LATENCY = registry.register(
+    Histogram("db_query_duration_seconds", "Duration of every SQL statement run by this process.")
+)
+DB_QUERIES_PER_REQUEST = registry.register(
+    Histogram(
+        "http_request_db_queries", "SQL statements per HTTP request by route template.",
+        ("method", "route"), buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    )
+)
+DB_TIME_PER_REQUEST = registry.register(
+    Histogram(
+        "http_request_db_seconds", "Time spent in SQL per HTTP request by route template.", ("method", "route")
+    )
+)
+JOB_LATENCY = registry.register(
+    Histogram(
+        "job_duration_seconds", "Background job duration by job and outcome.", ("job", "status"),
+        buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+    )
+)
+
+STARTUP_SECONDS = registry.register(
+    Gauge("app_startup_seconds", "Time from process import to serving, by phase.", ("phase",))
+)
+
+
+def record_startup_phase(phase: str, seconds: float):
+    STARTUP_SECONDS.set(seconds, phase)
+
+
+def record_job_duration(job: str, status: str, seconds: float):
+    JOB_LATENCY.observe(seconds, job, status)
+
+
+class QueryStats:
+    """SQL statements run on behalf of one request."""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+request_query_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+# Called with (statement, seconds) after every statement, so other
+# instrumentation (query_inspector) shares this timer instead of adding its own
+_statement_observers: list[Callable[[str, float], None]] = []
+
+
+def add_statement_observer(observer: Callable[[str, float], None]):
+    _statement_observers.append(observer)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = request_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    for observer in _statement_observers:
+        observer(statement, elapsed)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _discard_query_timer(context):
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def _collect_runtime_gauges() -> list[str]:
+    lines = []
+    pool = get_pool_status()
+    if "checked_out" in pool:
+        lines += [
+            "# TYPE db_pool_connections_checked_out gauge",
+            f"db_pool_connections_checked_out {pool['checked_out']}",
+        ]
+    lines += [
+        "# TYPE db_pool_checkout_timeouts_total counter",
+        f"db_pool_checkout_timeouts_total {pool['checkout_wait']['timeouts']}",
+    ]
+    logging_queue = log_queue_stats()
+    if logging_queue:
+        lines += [
+            "# TYPE log_records_dropped_total counter",
+            f"log_records_dropped_total {logging_queue['dropped']}",
+            "# TYPE log_queue_depth gauge",
+            f"log_queue_depth {logging_queue['queued']}",
+        ]
+    return lines
+
+
+registry.add_collector(_collect_runtime_gauges)
+
+# Label for requests that matched no route, keeping label cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route HTTP and SQL metrics.
+
+    Requests are labelled with the matched route's template (e.g.
+    `/courses/{course_id}`), never the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        body_bytes = 0
+
+        async def send_and_measure(message):
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        stats = QueryStats()
+        token = request_query_stats.set(stats)
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            request_query_stats.reset(token)
+
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS.inc(1, method, route, status_code)
+            HTTP_LATENCY.observe(elapsed, method, route)
+            HTTP_RESPONSE_BYTES.inc(body_bytes, method, route)
+            DB_QUERIES_PER_REQUEST.observe(stats.count, method, route)
+            DB_TIME_PER_REQUEST.observe(stats.seconds, method, route)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def require_metrics_token(authorization: str = Header(None)):
+    """Dependency admitting scrapers that send `Authorization: Bearer <METRICS_TOKEN>`."""
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not settings.METRICS_TOKEN or not hmac.compare_digest((authorization or "").encode(), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Serve this process's metrics over HTTP from a daemon thread (for Celery workers)."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,122 @@
+# app/utils/notifications.py
+
+from sqlalchemy import JSON, Select, String, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Course, Enrollment, Notification, NotificationType
+from app.models.association_tables import course_instructors
+from .helpers.bulk import BULK_CHUNK_SIZE, dialect_insert, sql_uuid
+
+
+def enrolled_students(*columns) -> Select:
+    """
+    Audience of students enrolled in courses.
+
+    Selects `user_id` (a student's id is their user id) plus any extra
+    columns, joined to `Course` so callers can filter and build messages on it.
+    """
+    return select(Enrollment.student_id.label("user_id"), *columns).join(
+        Course, Course.id == Enrollment.course_id
+    )
+
+
+def assigned_instructors(*columns) -> Select:
+    """Audience of instructors assigned to courses, shaped like `enrolled_students`."""
+    return select(course_instructors.c.instructor_id.label("user_id"), *columns).join(
+        Course, Course.id == course_instructors.c.course_id
+    )
+
+
+def make_dedup_key(prefix: str, column):
+    """Build a per-row deduplication key such as 'module_published:<module id>'."""
+    return (literal(f"{prefix}:") + cast(column, String)).label("dedup_key")
+
+
+async def fan_out_notifications(
+    db: AsyncSession,
+    audience: Select,
+    notification_type: NotificationType,
+    message: str | None = None,
+    dedup_key: str | None = None,
+    additional_data: dict | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """
+    Notify a whole audience with set-based `INSERT INTO notifications ... SELECT`.
+
+    The audience is a select with a `user_id` column. A fixed `message` and
+    `dedup_key` apply to every row; otherwise the select must provide
+    `message` (and optionally `dedup_key`) columns itself. Rows whose
+    (user_id, dedup_key) pair already exists are skipped, so re-running a job
+    does not notify anyone twice.
+
+    Large audiences are split into user_id ranges of about `chunk_size` rows,
+    one statement each. The caller owns the transaction and commits.
+
+    Args:
+        db (AsyncSession): The database session.
+        audience (Select): Recipients, see above.
+        notification_type (NotificationType): Type of every notification.
+        message (str | None): Message for every recipient.
+        dedup_key (str | None): Deduplication key for every recipient.
+        additional_data (dict | None): JSON payload for every notification.
+        chunk_size (int): Approximate rows per INSERT.
+
+    Returns:
+        int: Number of notifications created.
+    """
+    audience = audience.subquery()
+    columns = audience.c
+
+    # One pass over the audience yields the range boundaries for all chunks
+    numbered = select(
+        columns.user_id, func.row_number().over(order_by=columns.user_id).label("n")
+    ).subquery()
+    bounds = (
+        await db.scalars(
+            select(numbered.c.user_id)
+            .where(numbered.c.n % chunk_size == 0)
+            .order_by(numbered.c.n)
+        )
+    ).all()
+
+    rows = select(
+        sql_uuid(db),
+        columns.user_id,
+        literal(message) if message is not None else columns.message,
+        literal(notification_type, Notification.notification_type.type),
+        literal(False),
+        func.now(),
+        literal(additional_data or {}, JSON),
+        literal(dedup_key)
+        if dedup_key is not None
+        else (columns.dedup_key if "dedup_key" in columns else literal(None, String)),
+    ).where(columns.user_id.isnot(None))
+
+    created = 0
+    lower = None
+    for upper in [*bounds, None]:
+        chunk = rows
+        if lower is not None:
+            chunk = chunk.where(columns.user_id > lower)
+        if upper is not None:
+            chunk = chunk.where(columns.user_id <= upper)
+        result = await db.execute(
+            dialect_insert(db, Notification.__table__)
+            .from_select(
+                [
+                    "id",
+                    "user_id",
+                    "message",
+                    "notification_type",
+                    "is_read",
+                    "created_at",
+                    "additional_data",
+                    "dedup_key",
+                ],
+                chunk,
+            )
+            .on_conflict_do_nothing()
+        )
+        created += max(result.rowcount, 0)
+        lower = upper
+    return created
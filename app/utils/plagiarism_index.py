@@ -0,0 +1,111 @@
+# app/utils/plagiarism_index.py
+
+import heapq
+import re
+import zlib
+from uuid import UUID
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import PlagiarismFingerprint
+
+# Character n-gram length used for fingerprints
+SHINGLE_SIZE = 5
+# Number of smallest shingle hashes kept per submission (bottom-k sketch)
+SKETCH_SIZE = 128
+# Shared hashes needed for a submission to be checked in full. Unrelated
+# documents on the same topic typically share under 15% of their sketch,
+# while lightly edited copies share well over half.
+MIN_SHARED_HASHES = 32
+# Upper bound on candidates compared in full per check
+MAX_CANDIDATES = 50
+
+
+def preprocess_content(content: str) -> str:
+    """Normalize content for better comparison"""
+    if not content:
+        return ""
+
+    # Remove code comments and special characters
+    content = re.sub(r"#.*|\/\/.*|\/\*.*?\*\/", "", content, flags=re.DOTALL)
+    # Normalize whitespace and lowercase
+    return re.sub(r"\s+", " ", content).strip().lower()
+
+
+def fingerprint(text: str) -> list[int]:
+    """
+    Compute the bottom-k sketch of a normalized text.
+
+    Each character n-gram is hashed with CRC32 (stable across processes,
+    unlike `hash()`) and the SKETCH_SIZE smallest distinct hashes are kept.
+
+    Args:
+        text (str): Preprocessed submission content.
+
+    Returns:
+        list[int]: Sorted sketch hashes; empty for empty text.
+    """
+    if not text:
+        return []
+    shingles = {
+        zlib.crc32(text[i : i + SHINGLE_SIZE].encode())
+        for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))
+    }
+    return heapq.nsmallest(SKETCH_SIZE, shingles)
+
+
+async def index_submission(
+    db: AsyncSession, submission_id: UUID, assignment_id: UUID, content: str | None
+) -> list[int]:
+    """
+    Store (or replace) a submission's fingerprints in its assignment's index.
+
+    The caller owns the transaction and is responsible for committing.
+
+    Returns:
+        list[int]: The stored sketch.
+    """
+    hashes = fingerprint(preprocess_content(content))
+    await db.execute(
+        delete(PlagiarismFingerprint).where(
+            PlagiarismFingerprint.submission_id == submission_id
+        )
+    )
+    if hashes:
+        await db.execute(
+            insert(PlagiarismFingerprint),
+            [
+                {"submission_id": submission_id, "assignment_id": assignment_id, "hash": h}
+                for h in hashes
+            ],
+        )
+    return hashes
+
+
+async def find_candidates(
+    db: AsyncSession, submission_id: UUID, assignment_id: UUID, hashes: list[int]
+) -> dict[UUID, int]:
+    """
+    Find submissions to the same assignment that share enough fingerprints.
+
+    Returns:
+        dict[UUID, int]: Candidate submission IDs mapped to their shared hash
+        count, most similar first.
+    """
+    if not hashes:
+        return {}
+    # Scale the threshold down for short texts with fewer than SKETCH_SIZE shingles
+    min_shared = max(-(-len(hashes) * MIN_SHARED_HASHES // SKETCH_SIZE), 1)
+    shared = func.count().label("shared")
+    result = await db.execute(
+        select(PlagiarismFingerprint.submission_id, shared)
+        .where(
+            PlagiarismFingerprint.assignment_id == assignment_id,
+            PlagiarismFingerprint.hash.in_(hashes),
+            PlagiarismFingerprint.submission_id != submission_id,
+        )
+        .group_by(PlagiarismFingerprint.submission_id)
+        .having(shared >= min_shared)
+        .order_by(shared.desc())
+        .limit(MAX_CANDIDATES)
+    )
+    return {row.submission_id: row.shared for row in result}
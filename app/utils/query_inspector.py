@@ -0,0 +1,173 @@
+# app/utils/query_inspector.py
+
+import contextvars
+import re
+from collections import Counter
+from contextlib import contextmanager
+from app.config import settings
+from .logging_config import logger
+from .metrics import add_statement_observer
+
+# Development/test instrumentation: while a QueryLog is active in the current
+# context every statement is recorded by shape, so loops issuing the same
+# SELECT once per row (lazy relationships, per-item lookups) stand out.
+
+# Response headers set by QueryInspectionMiddleware
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_TIME_HEADER = "X-Query-Time-Ms"
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|\$\d+|:\w+)\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so calls differing only in parameters compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _LITERAL.sub("?", shape)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget when a block runs more statements than allowed."""
+
+
+class QueryLog:
+    """Statements run within one request, job or test block."""
+
+    def __init__(self, label: str, parent: "QueryLog" = None):
+        self.label = label
+        # Enclosing log (e.g. a test's budget around a job), which counts these too
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, elapsed)
+
+    def repeated(self, threshold: int = None) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, most frequent first."""
+        threshold = threshold or settings.QUERY_INSPECTION_N_PLUS_ONE_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self) -> None:
+        """Log each likely N+1 pattern found in this log."""
+        for shape, n in self.repeated():
+            logger.warning(
+                f"Possible N+1 in {self.label}: statement ran {n} times "
+                f"({self.count} total): {shape[:300]}"
+            )
+
+    def summary(self, limit: int = 5) -> str:
+        top = "\n".join(f"  {n}x {shape[:200]}" for shape, n in self.shapes.most_common(limit))
+        return f"{self.count} statements in {self.label}:\n{top}"
+
+
+current_query_log: contextvars.ContextVar[QueryLog | None] = contextvars.ContextVar(
+    "current_query_log", default=None
+)
+
+
+def _record_inspected_statement(statement: str, elapsed: float):
+    log = current_query_log.get()
+    if log is not None:
+        log.record(statement, elapsed)
+
+
+# Timed by the metrics module's cursor listeners
+add_statement_observer(_record_inspected_statement)
+
+
+@contextmanager
+def inspect_queries(label: str):
+    """
+    Record the statements run in this context and log likely N+1 patterns.
+
+    Args:
+        label (str): Names the request or job in the report.
+
+    Yields:
+        QueryLog: The log being filled.
+    """
+    log = QueryLog(label, parent=current_query_log.get())
+    token = current_query_log.set(log)
+    try:
+        yield log
+    finally:
+        current_query_log.reset(token)
+        log.report()
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "block"):
+    """
+    Fail if the enclosed code runs more than `max_queries` statements.
+
+    For code awaited in the current task, e.g. a job function or a request
+    sent through httpx's ASGITransport. Requests served on another thread
+    (Starlette's TestClient) can be checked with assert_query_budget instead.
+
+    Raises:
+        QueryBudgetExceeded: With the most frequent statement shapes.
+    """
+    with inspect_queries(label) as log:
+        yield log
+    if log.count > max_queries:
+        raise QueryBudgetExceeded(f"Query budget of {max_queries} exceeded: {log.summary()}")
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """
+    Fail if a response reports more than `max_queries` statements.
+
+    Requires QUERY_INSPECTION, which makes every response carry its count.
+    """
+    count = response.headers.get(QUERY_COUNT_HEADER)
+    if count is None:
+        raise QueryBudgetExceeded(f"Response has no {QUERY_COUNT_HEADER} header; is QUERY_INSPECTION on?")
+    if int(count) > max_queries:
+        raise QueryBudgetExceeded(
+            f"Query budget of {max_queries} exceeded: {count} statements for "
+            f"{response.request.method} {response.request.url.path}"
+        )
+
+
+class QueryInspectionMiddleware:
+    """
+    Pure ASGI middleware recording each request's statements.
+
+    Likely N+1 patterns are logged, and the statement count and time are
+    returned in response headers so tests and developers can check budgets.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with inspect_queries(f"{scope['method']} {scope['path']}") as log:
+
+            async def send_with_counts(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (QUERY_COUNT_HEADER.lower().encode(), str(log.count).encode()),
+                        (QUERY_TIME_HEADER.lower().encode(), f"{log.seconds * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_counts)
+            finally:
+                # Report by route template once routing has resolved it
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    log.label = f"{scope['method']} {route}"
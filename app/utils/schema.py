@@ -0,0 +1,66 @@
+# app/utils/schema.py
+
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.database import engine
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class SchemaVersionMismatch(RuntimeError):
+    """The database is not migrated to the revision this code expects."""
+
+
+def alembic_config():
+    """Alembic config for this project, independent of the working directory."""
+    # Imported here: only the bootstrap CLI and the startup check need Alembic
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return config
+
+
+def expected_schema_heads() -> set[str]:
+    """Head revision(s) of the migration scripts shipped with this code."""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+async def current_schema_revisions(conn: AsyncConnection) -> set[str] | None:
+    """
+    Revisions recorded in the database's alembic_version table.
+
+    Returns:
+        set[str] | None: The applied heads, or None if the database has
+        never been migrated.
+    """
+    try:
+        return set((await conn.scalars(text("SELECT version_num FROM alembic_version"))).all())
+    except DBAPIError:
+        # No alembic_version table
+        return None
+
+
+async def check_schema_version() -> str:
+    """
+    Verify the database is at the migration head, with a single round trip.
+
+    Returns:
+        str: The current revision.
+
+    Raises:
+        SchemaVersionMismatch: If the database is unmigrated, behind or ahead.
+    """
+    expected = expected_schema_heads()
+    async with engine.connect() as conn:
+        current = await current_schema_revisions(conn)
+    if current != expected:
+        raise SchemaVersionMismatch(
+            f"Database schema is at {sorted(current) if current else 'no revision'}, "
+            f"expected {sorted(expected)}. Run `python -m app.bootstrap` to migrate and seed."
+        )
+    return ",".join(sorted(current))
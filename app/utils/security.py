@@ -1,7 +1,9 @@
 # app/utils/security.py
 
 import os
+import asyncio
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import Depends, HTTPException, status
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
@@ -9,7 +11,16 @@ from pydantic import ValidationError
 from app.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing
+# off the event loop without starving the default executor.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_pending_password_jobs = 0
 
 
 # Hash a password
@@ -41,6 +52,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_password_job(func, *args):
+    """
+    Run a bcrypt call on the password executor, enforcing the queue-depth limit.
+
+    Raises:
+        HTTPException: 503 if too many hash/verify calls are already pending.
+    """
+    global _pending_password_jobs
+    if _pending_password_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending_password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _pending_password_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password executor without blocking the event loop.
+
+    Args: \n
+        password (str): The plain text password to be hashed.
+
+    Returns:
+        str: The hashed password.
+    """
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password executor without blocking the event loop.
+
+    Args: \n
+        plain_password (str): The plain text password.
+        hashed_password (str): The hashed password to compare with.
+
+    Returns:
+        bool: True if the passwords match, otherwise False.
+    """
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
 # JWT configuration
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
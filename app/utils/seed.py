@@ -1,147 +1,131 @@
 # app/utils/seed.py
 
-# app/utils/seed.py
-
+import uuid
 from app.models import User, Role, Permission, Admin
+from app.models.association_tables import role_permission
 from app.database import AsyncSessionLocal
 from sqlalchemy.future import select
-from app.utils import hash_password
+from app.utils import hash_password_async
+from .helpers.bulk import dialect_insert
+
+PERMISSIONS = [
+    "view_reports",
+    "manage_users",
+    "edit_settings",
+    "delete_data",
+    "manage_roles",
+    "manage_admins",
+    "manage_courses",
+    "manage_content",
+    "manage_comments",
+    "manage_enrollments",
+    "manage_assessments",
+    "view_analytics",
+    "manage_support_tickets",
+    "manage_certificates",
+    "manage_announcements",
+    "manage_discussions",
+    "view_courses",
+    "participate_in_discussions",
+    "submit_assignments",
+    "view_grades",
+    "grade_assignments",
+]
+
+ROLE_PERMISSIONS = {
+    "superadmin": PERMISSIONS,  # superadmin has all permissions
+    "moderator": ["view_reports", "manage_content", "manage_comments", "manage_discussions"],
+    "content_manager": ["manage_content", "manage_courses", "manage_announcements"],
+    "support": ["manage_support_tickets", "view_reports"],
+    "student": ["view_courses", "participate_in_discussions", "submit_assignments", "view_grades"],
+    "instructor": ["manage_courses", "grade_assignments", "manage_enrollments", "view_reports"],
+}
+
+SUPERADMIN_EMAIL = "superadmin@example.com"
 
 
 async def initialize_roles_and_permissions():
+    """
+    Upsert the built-in permissions, roles and their grants.
+
+    One INSERT ... ON CONFLICT DO NOTHING per table plus one id lookup each
+    for roles and permissions, so reruns are idempotent and cost five
+    statements however many rows already exist.
+    Existing grants are never removed. Failures are rolled back and re-raised.
+    """
     async with AsyncSessionLocal() as db:
         try:
-            # Define permissions
-            permissions = [
-                Permission(name="view_reports"),
-                Permission(name="manage_users"),
-                Permission(name="edit_settings"),
-                Permission(name="delete_data"),
-                Permission(name="manage_roles"),
-                Permission(name="manage_admins"),
-                Permission(name="manage_courses"),
-                Permission(name="manage_content"),
-                Permission(name="manage_comments"),
-                Permission(name="manage_enrollments"),
-                Permission(name="manage_assessments"),
-                Permission(name="view_analytics"),
-                Permission(name="manage_support_tickets"),
-                Permission(name="manage_certificates"),
-                Permission(name="manage_announcements"),
-                Permission(name="manage_discussions"),
-                Permission(name="view_courses"),
-                Permission(name="participate_in_discussions"),
-                Permission(name="submit_assignments"),
-                Permission(name="view_grades"),
-                Permission(name="grade_assignments"),
-            ]
-
-            # Insert permissions into the database if they don't exist
-            for perm in permissions:
-                existing_perm = await db.execute(
-                    select(Permission).filter(Permission.name == perm.name)
-                )
-                if not existing_perm.scalars().first():
-                    db.add(perm)
-
-            # Fetch permissions after inserting
-            await db.commit()
-            existing_permissions = {perm.name: perm for perm in (await db.execute(select(Permission))).scalars().all()}
-
-            # Define roles and their permissions
-            roles = [
-                Role(name="superadmin"),
-                Role(name="moderator"),
-                Role(name="content_manager"),
-                Role(name="support"),
-                Role(name="student"),
-                Role(name="instructor"),
-            ]
-
-            # Assign permissions to roles
-            roles[0].permissions = list(existing_permissions.values())  # superadmin has all permissions
-            roles[1].permissions = [
-                existing_permissions.get("view_reports"),
-                existing_permissions.get("manage_content"),
-                existing_permissions.get("manage_comments"),
-                existing_permissions.get("manage_discussions"),
-            ]  # moderator
-            roles[2].permissions = [
-                existing_permissions.get("manage_content"),
-                existing_permissions.get("manage_courses"),
-                existing_permissions.get("manage_announcements"),
-            ]  # content manager
-            roles[3].permissions = [
-                existing_permissions.get("manage_support_tickets"),
-                existing_permissions.get("view_reports"),
-            ]  # support
-            roles[4].permissions = [
-                existing_permissions.get("view_courses"),
-                existing_permissions.get("participate_in_discussions"),
-                existing_permissions.get("submit_assignments"),
-                existing_permissions.get("view_grades"),
-            ]  # student
-            roles[5].permissions = [
-                existing_permissions.get("manage_courses"),
-                existing_permissions.get("grade_assignments"),
-                existing_permissions.get("manage_enrollments"),
-                existing_permissions.get("view_reports"),
-            ]  # instructor
+            await db.execute(
+                dialect_insert(db, Permission.__table__)
+                .values([{"id": uuid.uuid4(), "name": name} for name in PERMISSIONS])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            await db.execute(
+                dialect_insert(db, Role.__table__)
+                .values([{"id": uuid.uuid4(), "name": name} for name in ROLE_PERMISSIONS])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
 
-            # Insert roles into the database if they don't exist
-            for role in roles:
-                existing_role = await db.execute(
-                    select(Role).filter(Role.name == role.name)
+            role_ids = dict(
+                (await db.execute(select(Role.name, Role.id).where(Role.name.in_(ROLE_PERMISSIONS)))).all()
+            )
+            permission_ids = dict(
+                (await db.execute(select(Permission.name, Permission.id).where(Permission.name.in_(PERMISSIONS)))).all()
+            )
+            await db.execute(
+                dialect_insert(db, role_permission)
+                .values(
+                    [
+                        {"role_id": role_ids[role], "permission_id": permission_ids[perm]}
+                        for role, perms in ROLE_PERMISSIONS.items()
+                        for perm in perms
+                    ]
                 )
-                if not existing_role.scalars().first():
-                    db.add(role)
+                .on_conflict_do_nothing()
+            )
 
             await db.commit()
             print("Roles and permissions initialized successfully.")
 
-        except Exception as e:
+        except Exception:
             await db.rollback()
-            print(f"Error initializing roles and permissions: {e}")
+            raise
 
 async def seed_superadmin():
+    """Create the superadmin user once. Failures are rolled back and re-raised."""
     async with AsyncSessionLocal() as db:
         try:
-            # Check if superadmin already exists
-            superadmin_email = "superadmin@example.com"
-            existing_user = await db.execute(
-                select(User).filter(User.email == superadmin_email)
-            )
-            if existing_user.scalars().first():
+            # Checked first so the bcrypt hash is only paid on the first run
+            existing_user = await db.scalar(select(User.id).filter(User.email == SUPERADMIN_EMAIL))
+            if existing_user:
                 print("Superadmin already exists.")
                 return
 
-            # Fetch the superadmin role
-            superadmin_role = await db.execute(
-                select(Role).filter(Role.name == "superadmin")
-            )
-            superadmin_role = superadmin_role.scalars().first()
-
-            if not superadmin_role:
+            superadmin_role_id = await db.scalar(select(Role.id).filter(Role.name == "superadmin"))
+            if not superadmin_role_id:
                 raise Exception("Superadmin role not found. Please initialize roles first.")
 
-            # Create the superadmin user
-            superadmin = User(
-                full_name="Super Admin",
-                email=superadmin_email,
-                hashed_password=hash_password("superadmin"),
-                role=superadmin_role
+            # Create the superadmin user and its Admin entry in one transaction;
+            # a concurrent bootstrap that got there first makes this a no-op
+            superadmin_id = await db.scalar(
+                dialect_insert(db, User.__table__)
+                .values(
+                    id=uuid.uuid4(),
+                    full_name="Super Admin",
+                    email=SUPERADMIN_EMAIL,
+                    hashed_password=await hash_password_async("superadmin"),
+                    role_id=superadmin_role_id,
+                )
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(User.__table__.c.id)
             )
-            db.add(superadmin)
-            await db.commit()
-
-            # Create the corresponding Admin entry
-            admin = Admin(id=superadmin.id)
-            db.add(admin)
+            if superadmin_id:
+                await db.execute(dialect_insert(db, Admin.__table__).values(id=superadmin_id))
             await db.commit()
 
             print("Superadmin created successfully.")
-        except Exception as e:
-            print(f"Error seeding superadmin: {e}")
+        except Exception:
             await db.rollback()
+            raise
         finally:
             await db.close()
@@ -0,0 +1,163 @@
+# app/utils/token_cache.py
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.config import settings
+from app.models import User, Role
+from .cache import response_cache, user_tag
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """A verified access token and the user it resolved to."""
+    payload: dict
+    user: dict
+    role: dict | None
+    expires_at: float
+    version: int  # The user's token version when cached, see user_token_version
+
+
+class TokenCache:
+    """
+    Bounded, TTL-based LRU cache of verified access tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token so the token
+    itself is never kept in memory, and never outlive the token's `exp`.
+    The cache is local to the process; get_verified_token checks an entry's
+    version against the cache backend so revocations from other processes
+    apply too.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._digests_by_user: dict[UUID, set[str]] = {}
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> CachedToken | None:
+        """Return the cached entry for a token, or None if missing or expired."""
+        if self.max_size <= 0:
+            return None
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            self._discard(digest)
+            return None
+        self._entries.move_to_end(digest)
+        return entry
+
+    def set(self, token: str, payload: dict, user: User, version: int) -> None:
+        """Cache a verified payload together with a column snapshot of the user."""
+        if self.max_size <= 0:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, float(payload["exp"]))
+        role = user.role
+        entry = CachedToken(
+            payload=payload,
+            user={attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs},
+            role=(
+                {attr.key: getattr(role, attr.key) for attr in inspect(Role).column_attrs}
+                if role is not None
+                else None
+            ),
+            expires_at=expires_at,
+            version=version,
+        )
+        digest = self._digest(token)
+        self._discard(digest)
+        self._entries[digest] = entry
+        self._digests_by_user.setdefault(user.id, set()).add(digest)
+        while len(self._entries) > self.max_size:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached token belonging to a user."""
+        for digest in self._digests_by_user.pop(user_id, set()):
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_user.clear()
+
+    def _discard(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = entry.user["id"]
+        digests = self._digests_by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_user[user_id]
+
+
+async def attach_cached_user(db: AsyncSession, entry: CachedToken) -> User:
+    """
+    Rebuild the cached user and attach it to the session without a SELECT.
+
+    Args:
+        db (AsyncSession): The request's database session.
+        entry (CachedToken): The cached token entry.
+
+    Returns:
+        User: A persistent user (with its role) bound to `db`.
+    """
+    user = User(**entry.user)
+    make_transient_to_detached(user)
+    if entry.role is not None:
+        role = Role(name=entry.role["name"])
+        for key, value in entry.role.items():
+            setattr(role, key, value)
+        make_transient_to_detached(role)
+        # Bypass history and backrefs so merge(load=False) sees a clean object
+        set_committed_value(user, "role", role)
+    return await db.merge(user, load=False)
+
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+async def user_token_version(user_id: UUID) -> int:
+    """
+    Version of a user's cached tokens, bumped by invalidate_user_tokens.
+
+    Kept in the response cache backend, so with CACHE_BACKEND=redis every
+    process sees a bump made by any other; read it before trusting a cached
+    token and record it when caching one.
+    """
+    (version,) = await response_cache.tag_versions(user_tag(user_id))
+    return version
+
+
+async def get_verified_token(token: str) -> CachedToken | None:
+    """Return the cached entry for a token unless it expired or its user's tokens were revoked since."""
+    entry = token_cache.get(token)
+    if entry is None:
+        return None
+    user_id = entry.user["id"]
+    if await user_token_version(user_id) != entry.version:
+        token_cache.invalidate_user(user_id)
+        return None
+    return entry
+
+
+async def invalidate_user_tokens(user_id: UUID) -> None:
+    """Revoke cached tokens for a user, in every process, after their account or role changes."""
+    token_cache.invalidate_user(user_id)
+    await response_cache.invalidate(user_tag(user_id))
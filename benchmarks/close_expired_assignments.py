@@ -0,0 +1,114 @@
+# benchmarks/close_expired_assignments.py
+"""
+close_expired_assignments against a large submissions table.
+
+Seeds courses, enrolled students, assignments (half already past due) and
+about a million submissions, then times the job twice: the first run closes
+the expired assignments and notifies students who did not submit, the second
+finds nothing to close and shows the cost of the due-date scan alone.
+
+Run it against a scratch database; it creates the schema and adds rows:
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db python -m benchmarks.close_expired_assignments
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+
+from app.background_tasks.jobs.assignment_jobs import close_expired_assignments
+from app.background_tasks.runner import run_async
+from app.database import Base, engine
+from app.models import Assignment, Course, Enrollment, Notification, Student, Submission, User
+
+INSERT_BATCH = 10_000
+
+
+async def insert_rows(conn, table, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_BATCH):
+        await conn.execute(insert(table), rows[start : start + INSERT_BATCH])
+
+
+async def seed(courses: int, assignments: int, students: int, submit_rate: float) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rng = random.Random(42)
+    submitted = 0
+    for _ in range(courses):
+        course_id = uuid.uuid4()
+        student_ids = [uuid.uuid4() for _ in range(students)]
+        assignment_rows = [
+            {
+                "id": uuid.uuid4(),
+                "course_id": course_id,
+                "title": f"Assignment {n}",
+                # Half are already past due
+                "due_date": now + timedelta(days=-1 if n % 2 else 7),
+            }
+            for n in range(assignments)
+        ]
+        submission_rows = [
+            {
+                "id": uuid.uuid4(),
+                "assignment_id": assignment["id"],
+                "student_id": student_id,
+                "content": "",
+                "submitted_at": now,
+            }
+            for assignment in assignment_rows
+            for student_id in student_ids
+            if rng.random() < submit_rate
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(insert(Course), [{"id": course_id, "title": "Course"}])
+            await insert_rows(
+                conn,
+                User,
+                [
+                    {"id": sid, "full_name": "Student", "email": f"{sid}@bench", "hashed_password": "x"}
+                    for sid in student_ids
+                ],
+            )
+            await insert_rows(conn, Student, [{"id": sid} for sid in student_ids])
+            await insert_rows(
+                conn, Enrollment, [{"student_id": sid, "course_id": course_id} for sid in student_ids]
+            )
+            await insert_rows(conn, Assignment, assignment_rows)
+            await insert_rows(conn, Submission, submission_rows)
+        submitted += len(submission_rows)
+    return submitted
+
+
+async def count(model) -> int:
+    async with engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(model))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--assignments", type=int, default=20, help="per course")
+    parser.add_argument("--students", type=int, default=1250, help="enrolled per course")
+    parser.add_argument("--submit-rate", type=float, default=0.8)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    submitted = run_async(seed(args.courses, args.assignments, args.students, args.submit_rate))
+    print(f"seeded {submitted:,} submissions in {time.perf_counter() - start:.1f}s")
+
+    for label in ("closing run", "no-op run"):
+        notifications = run_async(count(Notification))
+        start = time.perf_counter()
+        result = close_expired_assignments.run()
+        elapsed = time.perf_counter() - start
+        created = run_async(count(Notification)) - notifications
+        print(f"{label:>12}: {elapsed:.2f}s | {result} | {created:,} notifications")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/import_time.py
+"""
+Import-time budget for the API and worker entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and fails if its cumulative import time exceeds the budget, or if it pulled
+in a module it must not (the plagiarism stack outside plagiarism runs). Each
+entry point is imported several times and the fastest run is kept, which
+filters out a cold disk cache.
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db python -m benchmarks.import_time
+
+The budgets sit about 40% above the fastest of three warm imports on a
+developer machine (1.1-1.4s), so a regression that doubles cold start fails.
+On slower hosts set IMPORT_TIME_BUDGET_SCALE (or pass --scale) rather than
+editing them. tests/benchmarks/test_import_time.py runs the same checks with
+the test suite; IMPORT_TIME_BUDGET_SCALE=0 skips its timing part.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# module -> (budget in seconds, modules it must not import)
+ENTRY_POINTS = {
+    "app.main": (2.0, ("sklearn", "scipy", "numpy", "alembic.command")),
+    "app.background_tasks.tasks": (2.0, ("sklearn", "scipy", "numpy", "app.main")),
+}
+
+DEFAULT_RUNS = 3
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Cumulative import time of `module` in seconds, and every module it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    total, loaded = 0, set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = match.groups()
+        loaded.add(name)
+        # Top-level imports are indented by a single space
+        if len(indent) == 1:
+            total += int(cumulative)
+    return total / 1e6, loaded
+
+
+def fastest(module: str, runs: int = DEFAULT_RUNS) -> tuple[float, set[str]]:
+    """The fastest of `runs` measurements of `module`."""
+    return min((measure(module) for _ in range(runs)), key=lambda run: run[0])
+
+
+def budget_scale() -> float:
+    """Budget multiplier from IMPORT_TIME_BUDGET_SCALE, 1.0 by default."""
+    return float(os.getenv("IMPORT_TIME_BUDGET_SCALE", "1.0"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="imports per entry point, fastest kept")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=budget_scale(),
+        help="multiply every budget, e.g. on slow CI (default: $IMPORT_TIME_BUDGET_SCALE or 1.0)",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module, (budget, forbidden) in ENTRY_POINTS.items():
+        seconds, loaded = fastest(module, args.runs)
+        leaked = sorted(name for name in forbidden if name in loaded)
+        over = seconds > budget * args.scale
+        failed |= over or bool(leaked)
+        status = "FAIL" if over or leaked else "ok"
+        print(f"{status:>4} {module}: {seconds:.2f}s (budget {budget * args.scale:.2f}s)")
+        if leaked:
+            print(f"     imported {', '.join(leaked)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/password_hashing.py
+"""
+Event-loop latency while logins run concurrently.
+
+A probe task stands in for "other routes": it sleeps for a fixed interval and
+records how late it wakes up. We run it alongside a burst of password
+verifications, once calling bcrypt inline (the old behaviour) and once through
+the bounded password executor.
+
+Usage:
+    python -m benchmarks.password_hashing [--logins 32] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.utils.security import pwd_context, verify_password, verify_password_async
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(stop: asyncio.Event, lags: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def inline_login(hashed: str):
+    verify_password("correct horse", hashed)
+
+
+async def offloaded_login(hashed: str):
+    await verify_password_async("correct horse", hashed)
+
+
+async def run(login, hashed: str, logins: int) -> dict:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    return {
+        "wall_s": elapsed,
+        "probe_samples": len(lags_ms),
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) > 1 else lags_ms[0],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    hashed = pwd_context.hash("correct horse", rounds=args.rounds)
+    for name, login in (("inline", inline_login), ("executor", offloaded_login)):
+        result = asyncio.run(run(login, hashed, args.logins))
+        print(
+            f"{name:>8}: {args.logins} logins in {result['wall_s']:.2f}s | "
+            f"loop lag p50={result['lag_p50_ms']:.1f}ms "
+            f"p99={result['lag_p99_ms']:.1f}ms max={result['lag_max_ms']:.1f}ms "
+            f"({result['probe_samples']} probes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
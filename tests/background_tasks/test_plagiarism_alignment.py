@@ -0,0 +1,43 @@
+# tests/background_tasks/test_plagiarism_alignment.py
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from app.background_tasks.alignment import ALIGNMENT_WINDOW, align_pair
+
+
+# A wide alphabet keeps every character under SequenceMatcher's autojunk
+# popularity cut-off, so long texts still align
+ALPHABET = [chr(code) for code in range(0x4E00, 0x4E00 + 500)]
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_window_ratio_matches_sequence_matcher(seed):
+    rng = random.Random(seed)
+    a = random_text(rng, rng.randint(50, ALIGNMENT_WINDOW))
+    b = random_text(rng, rng.randint(50, ALIGNMENT_WINDOW))
+
+    assert align_pair(a, b)["ratio"] == pytest.approx(SequenceMatcher(None, a, b).ratio())
+
+
+def test_repeated_source_does_not_recount_target():
+    # Every window of `a` matches the same paragraph of `b`
+    paragraph = random_text(random.Random(0), ALIGNMENT_WINDOW)
+    a = paragraph * 5
+    b = paragraph + "x" * (4 * ALIGNMENT_WINDOW)
+
+    ratio = align_pair(a, b)["ratio"]
+
+    assert ratio == pytest.approx(2 * len(paragraph) / (len(a) + len(b)))
+    assert ratio <= SequenceMatcher(None, a, b).ratio() + 1e-9
+
+
+def test_identical_texts_score_one():
+    text = random_text(random.Random(1), 3 * ALIGNMENT_WINDOW)
+
+    assert align_pair(text, text)["ratio"] == pytest.approx(1.0)
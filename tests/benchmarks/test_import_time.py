@@ -0,0 +1,17 @@
+# tests/benchmarks/test_import_time.py
+import pytest
+
+from benchmarks.import_time import ENTRY_POINTS, budget_scale, fastest
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_budget(module):
+    budget, forbidden = ENTRY_POINTS[module]
+    scale = budget_scale()
+
+    seconds, loaded = fastest(module)
+
+    assert not loaded & set(forbidden)
+    if not scale:
+        pytest.skip("import-time budget disabled by IMPORT_TIME_BUDGET_SCALE=0")
+    assert seconds <= budget * scale, f"{module} imported in {seconds:.2f}s, budget {budget * scale:.2f}s"
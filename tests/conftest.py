@@ -0,0 +1,15 @@
+# tests/conftest.py
+import os
+import tempfile
+
+TMP = tempfile.gettempdir()
+
+# Settings without defaults; a throwaway SQLite file and log keep imports of
+# app.* from touching real ones
+os.environ.setdefault("APP_NAME", "AetherLMS")
+os.environ.setdefault("APP_DESCRIPTION", "AetherLMS test suite")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(TMP, 'aetherlms-test.db')}")
+os.environ.setdefault("LOG_FILE", os.path.join(TMP, "aetherlms-test.log"))
+os.environ.setdefault("DB_ECHO", "false")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
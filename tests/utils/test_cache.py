@@ -0,0 +1,59 @@
+# tests/utils/test_cache.py
+import asyncio
+
+import pytest
+
+from app.utils.cache import CacheBackend, MemoryCacheBackend, ResponseCache
+
+
+def make_cache(max_size: int = 100) -> ResponseCache:
+    return ResponseCache(MemoryCacheBackend(max_size), prefix="test", default_ttl=60, lock_timeout=1)
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_tag_versions_are_bounded():
+    backend = MemoryCacheBackend(max_size=3)
+
+    asyncio.run(backend.get_versions([f"course:{i}" for i in range(10)]))
+
+    assert len(backend._versions) == 3
+
+
+def test_evicted_tag_does_not_revive_stale_entries():
+    cache = make_cache(max_size=2)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        assert await cache.get_or_set("detail", compute, tags=["course:a"]) == 1
+        await cache.invalidate("course:a")
+        assert await cache.get_or_set("detail", compute, tags=["course:a"]) == 2
+        # Push course:a's version out of the LRU, then read it again
+        await cache.backend.get_versions(["course:b", "course:c"])
+        return await cache.get_or_set("detail", compute, tags=["course:a"])
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_fill_survives_the_caller_that_started_it():
+    cache = make_cache()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        first = asyncio.create_task(cache.get_or_set("slow", compute))
+        second = asyncio.create_task(cache.get_or_set("slow", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "value"
@@ -0,0 +1,25 @@
+# tests/utils/test_logging_config.py
+import os
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.utils.logging_config import logger, stop_logging
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_records_reach_log_file():
+    marker = f"forked-child-{uuid.uuid4()}"
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            logger.info(marker)
+            stop_logging()  # Flushes the child's queue, as a clean worker exit would
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    with open(settings.LOG_FILE) as log_file:
+        assert marker in log_file.read()
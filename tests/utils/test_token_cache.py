@@ -0,0 +1,41 @@
+# tests/utils/test_token_cache.py
+import asyncio
+import time
+import uuid
+
+from app.models import User
+from app.utils.cache import response_cache, user_tag
+from app.utils.token_cache import (
+    get_verified_token,
+    invalidate_user_tokens,
+    token_cache,
+    user_token_version,
+)
+
+
+def cache_token(token: str) -> User:
+    user = User(id=uuid.uuid4(), full_name="Test User", email=f"{uuid.uuid4()}@example.com")
+    payload = {"sub": user.email, "scopes": ["student"], "exp": time.time() + 600}
+    token_cache.set(token, payload, user, asyncio.run(user_token_version(user.id)))
+    return user
+
+
+def test_cached_token_is_served_until_revoked():
+    user = cache_token("token-a")
+
+    assert asyncio.run(get_verified_token("token-a")).user["id"] == user.id
+
+    asyncio.run(invalidate_user_tokens(user.id))
+
+    assert asyncio.run(get_verified_token("token-a")) is None
+
+
+def test_revocation_from_another_process_is_seen():
+    user = cache_token("token-b")
+
+    # Another process only bumps the shared version; this process's entry stays
+    asyncio.run(response_cache.invalidate(user_tag(user.id)))
+
+    assert token_cache.get("token-b") is not None
+    assert asyncio.run(get_verified_token("token-b")) is None
+    assert token_cache.get("token-b") is None